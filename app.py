@@ -1,84 +1,42 @@
 # app.py
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 import dash
-from dash import dcc, html, Input, Output
+from dash import dcc, html, Input, Output, State, ClientsideFunction
 import dash_bootstrap_components as dbc
-import numpy as np
 import os
+import numpy as np
+from dash.exceptions import PreventUpdate
+from flask import jsonify
 
-# --- 1. Muat Data dan Model ---
-# Untuk production, kita akan menggunakan data dummy yang sudah didefinisikan
-# karena file CSV dan model mungkin tidak tersedia di deployment
-def create_dummy_data():
-    """Membuat data dummy untuk testing dan production"""
-    np.random.seed(42)  # Untuk konsistensi data
-    return pd.DataFrame({
-        'year': range(1985, 2024),
-        'renewables_share_elec': np.random.uniform(5, 20, 39),
-        'renewables_electricity': np.random.uniform(10, 100, 39),
-        'fossil_electricity': np.random.uniform(100, 300, 39),
-        'solar_electricity': np.random.uniform(0, 10, 39),
-        'wind_electricity': np.random.uniform(0, 5, 39),
-        'renewables_share_energy': np.random.uniform(8, 25, 39),
-        'renewables_yoy_growth': np.random.uniform(-5, 15, 39),
-        'fossil_yoy_growth': np.random.uniform(-2, 8, 39),
-        'carbon_intensity_elec': np.random.uniform(500, 800, 39),
-        'fossil_share_elec': np.random.uniform(70, 95, 39),
-        'share_hydro_in_renew': np.random.uniform(60, 90, 39)
-    })
-
-# Coba muat data dari file, jika gagal gunakan dummy data
-try:
-    if os.path.exists('data/indo_energy_filled.csv'):
-        df = pd.read_csv('data/indo_energy_filled.csv')
-    elif os.path.exists('../data/indo_energy_filled.csv'):
-        df = pd.read_csv('../data/indo_energy_filled.csv')
-    else:
-        raise FileNotFoundError("Data file not found")
-except (FileNotFoundError, pd.errors.EmptyDataError):
-    print("Using dummy data for production deployment")
-    df = create_dummy_data()
-
-# Nilai prediksi yang sudah dihitung (untuk production)
-prediksi_pangsa_ebt_2025 = 18.68
-pred_yoy_ebt_2024 = 10.63
-pred_yoy_ebt_2025 = 11.29
-mean_preds_2024 = 10.50
-std_preds_2024 = 0.75
-mean_preds_2025 = 11.23
-std_preds_2025 = 0.82
-
-# Hitung KPI dan nilai-nilai tetap
-pangsa_ebt_saat_ini = df[df['year'] == 2023]['renewables_share_elec'].iloc[0] if len(df[df['year'] == 2023]) > 0 else df['renewables_share_elec'].iloc[-1]
-target_pemerintah_2025 = 23.0
-gap_menuju_target_2025 = target_pemerintah_2025 - prediksi_pangsa_ebt_2025
-status_target = "Tercapai ✅" if gap_menuju_target_2025 <= 0 else "Belum Tercapai ❌"
-
-# Filter data untuk Line Chart (1985-2023)
-df_line_chart = df[(df['year'] >= 1985) & (df['year'] <= 2023)].copy()
-
-# Gabungkan data historis dan prediksi
-future_share_df = pd.DataFrame({
-    'year': [2024, 2025],
-    'renewables_share_elec': [prediksi_pangsa_ebt_2025 - 1, prediksi_pangsa_ebt_2025]
-})
-combined_share_df = pd.concat([df_line_chart[['year', 'renewables_share_elec']], future_share_df])
-
-# Data untuk YoY growth
-future_yoy_df = pd.DataFrame({
-    'year': [2024, 2025],
-    'renewables_yoy_growth': [pred_yoy_ebt_2024, pred_yoy_ebt_2025]
-})
-combined_yoy_df = pd.concat([df_line_chart[['year', 'renewables_yoy_growth']], future_yoy_df])
-
-# --- 2. Inisialisasi Aplikasi Dash ---
+from background_jobs import create_background_manager
+from dashboard_state import create_state, create_watcher, target_pemerintah_2025
+from hot_reload import Snapshot
+from figure_cache import FigureCache, install as install_figure_cache
+from instrumentation import install as install_instrumentation, instrument_callback, set_labels, timed
+from lazy import LazyModule, import_now
+from model_store import forest_arrays, model_path, scenario_features
+from payload import install as install_compression
+from scenario_api import create_scenario_blueprint
+from startup_bundle import load_bundle
+from uncertainty import uncertainty_sweep
+
+# Pustaka berat baru diimpor saat figure pertama kali dibangun
+pd = LazyModule('pandas')
+px = LazyModule('plotly.express')
+go = LazyModule('plotly.graph_objects')
+
+# Simulasi dijalankan di browser (clientside); set CLIENTSIDE_SIMULATION=0
+# untuk kembali ke callback server
+CLIENTSIDE_SIMULATION = os.environ.get('CLIENTSIDE_SIMULATION', '1') == '1'
+
+# --- 1. Inisialisasi Aplikasi Dash ---
 app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
 app.title = "Dashboard Energi Terbarukan Indonesia"
 server = app.server  # Untuk deployment
+install_instrumentation(server)  # Server-Timing dan /metrics (INSTRUMENTATION=0 untuk mematikan)
+compressor = install_compression(server)  # gzip/brotli (RESPONSE_COMPRESSION=0 untuk mematikan)
+install_figure_cache(server)  # JSON tab dari cache disisipkan sebelum kompresi
 
-# --- 3. Definisikan Layout Dashboard ---
+# --- 2. Definisikan Layout Dashboard ---
 app.layout = dbc.Container([
     html.H1(
         "Transisi Energi Terbarukan Indonesia: Seberapa Dekat Kita dengan Target 2025?",
@@ -108,308 +66,484 @@ app.layout = dbc.Container([
 
 ], fluid=True)
 
-# --- Callback untuk Mengganti Konten Tab ---
-@app.callback(
-    Output("tab-content", "children"),
-    Input("main-tabs", "value")
-)
-def render_tab_content(tab_selected):
-    if tab_selected == "tab-1-overview":
-        return dbc.Container([
-            html.H2("Progres Target Bauran Energi Terbarukan Nasional", className="mb-4 text-center"),
-            dbc.Row([
-                # Key Performance Indicators
-                dbc.Col(dbc.Card([
-                    dbc.CardHeader("Pangsa EBT Saat Ini (2023)"),
-                    dbc.CardBody(html.H4(f"{pangsa_ebt_saat_ini:.2f}%", className="card-title"))
-                ]), md=4, className="mb-3"),
-                dbc.Col(dbc.Card([
-                    dbc.CardHeader("Prediksi Pangsa EBT 2025"),
-                    dbc.CardBody(html.H4(f"{prediksi_pangsa_ebt_2025:.2f}%", className="card-title"))
-                ]), md=4, className="mb-3"),
-                dbc.Col(dbc.Card([
-                    dbc.CardHeader("Gap Menuju Target 2025"),
-                    dbc.CardBody(html.H4(f"{gap_menuju_target_2025:.2f}% {status_target}", className="card-title"))
-                ]), md=4, className="mb-3"),
-            ], className="mb-4"),
-            
-            dbc.Row([
-                # Gauge Chart
-                dbc.Col(
-                    dcc.Graph(
-                        id="gauge-chart-ebt",
-                        figure=go.Figure(go.Indicator(
-                            mode="gauge+number+delta",
-                            value=prediksi_pangsa_ebt_2025,
-                            delta={'reference': target_pemerintah_2025, 'increasing': {'color': "green"}, 'decreasing': {'color': "red"}},
-                            gauge={
-                                'axis': {'range': [0, 30]},
-                                'bar': {'color': "blue"},
-                                'steps': [
-                                    {'range': [0, target_pemerintah_2025], 'color': "lightgray"},
-                                    {'range': [target_pemerintah_2025, 30], 'color': "lightgreen"}
-                                ],
-                                'threshold': {
-                                    'line': {'color': "red", 'width': 4},
-                                    'thickness': 0.75,
-                                    'value': target_pemerintah_2025
-                                }
-                            },
-                            title={'text': "Pangsa Energi Terbarukan 2025 (% Target Pemerintah)"}
-                        )).update_layout(height=400)
-                    ),
-                    md=6, className="mb-3"
+# --- 3. Konten untuk Setiap Tab ---
+SCENARIO_COLORS = ('seagreen', 'darkgreen', 'teal')
+
+def build_share_figure(df_line_chart, series):
+    """Pangsa EBT historis, proyeksi rekursif, dan jalur kebijakan"""
+    fig = px.line(
+        df_line_chart,
+        x='year',
+        y='renewables_share_elec',
+        title='Pangsa EBT dalam Pembangkitan Listrik Indonesia',
+        labels={'renewables_share_elec': 'Persentase (%)'},
+        markers=True
+    ).add_hline(
+        y=target_pemerintah_2025,
+        line_dash="dot",
+        line_color="red",
+        annotation_text=f"Target 23% (2025)",
+        annotation_position="bottom right"
+    ).add_trace(go.Scatter(
+        x=series['future_share_df']['year'],
+        y=series['future_share_df']['renewables_share_elec'],
+        mode='lines+markers',
+        name='Prediksi (RF)',
+        line=dict(dash='dash', color='orange')
+    ))
+    for color, (label, frame) in zip(SCENARIO_COLORS, series['scenarios'].items()):
+        fig.add_trace(go.Scatter(
+            x=frame['year'], y=frame['renewables_share_elec'],
+            mode='lines', name=label, line=dict(dash='dot', color=color)
+        ))
+    return fig.update_layout(hovermode="x unified", legend_title_text="Kategori")
+
+def build_tab_overview(snap):
+    kpis, series = snap.kpis, snap.series
+    return dbc.Container([
+        html.H2("Progres Target Bauran Energi Terbarukan Nasional", className="mb-4 text-center"),
+        dbc.Row([
+            # Key Performance Indicators
+            dbc.Col(dbc.Card([
+                dbc.CardHeader(f"Pangsa EBT Saat Ini ({kpis['tahun_terakhir']})"),
+                dbc.CardBody(html.H4(f"{kpis['pangsa_ebt_saat_ini']:.2f}%", className="card-title"))
+            ]), md=4, className="mb-3"),
+            dbc.Col(dbc.Card([
+                dbc.CardHeader("Prediksi Pangsa EBT 2025"),
+                dbc.CardBody(html.H4(f"{kpis['prediksi_pangsa_ebt_2025']:.2f}%", className="card-title"))
+            ]), md=4, className="mb-3"),
+            dbc.Col(dbc.Card([
+                dbc.CardHeader("Gap Menuju Target 2025"),
+                dbc.CardBody(html.H4(f"{kpis['gap_menuju_target_2025']:.2f}% {kpis['status_target']}", className="card-title"))
+            ]), md=4, className="mb-3"),
+        ], className="mb-4"),
+        
+        dbc.Row([
+            # Gauge Chart
+            dbc.Col(
+                dcc.Graph(
+                    id="gauge-chart-ebt",
+                    figure=go.Figure(go.Indicator(
+                        mode="gauge+number+delta",
+                        value=kpis['prediksi_pangsa_ebt_2025'],
+                        delta={'reference': target_pemerintah_2025, 'increasing': {'color': "green"}, 'decreasing': {'color': "red"}},
+                        gauge={
+                            'axis': {'range': [0, 30]},
+                            'bar': {'color': "blue"},
+                            'steps': [
+                                {'range': [0, target_pemerintah_2025], 'color': "lightgray"},
+                                {'range': [target_pemerintah_2025, 30], 'color': "lightgreen"}
+                            ],
+                            'threshold': {
+                                'line': {'color': "red", 'width': 4},
+                                'thickness': 0.75,
+                                'value': target_pemerintah_2025
+                            }
+                        },
+                        title={'text': "Pangsa Energi Terbarukan 2025 (% Target Pemerintah)"}
+                    )).update_layout(height=400)
                 ),
-                
-                # Line Chart Tren Utama
-                dbc.Col([
-                    dcc.Graph(
-                        id="line-chart-ebt-share",
-                        figure=px.line(
-                            df_line_chart,
-                            x='year',
-                            y='renewables_share_elec',
-                            title='Pangsa EBT dalam Pembangkitan Listrik Indonesia',
-                            labels={'renewables_share_elec': 'Persentase (%)'},
-                            markers=True
-                        ).add_hline(
-                            y=target_pemerintah_2025,
-                            line_dash="dot",
-                            line_color="red",
-                            annotation_text=f"Target 23% (2025)",
-                            annotation_position="bottom right"
-                        ).add_trace(go.Scatter(
-                            x=future_share_df['year'],
-                            y=future_share_df['renewables_share_elec'],
-                            mode='lines+markers',
-                            name='Prediksi (RF)',
-                            line=dict(dash='dash', color='orange')
-                        )).update_layout(hovermode="x unified", legend_title_text="Kategori")
-                    )
-                ], md=6, className="mb-3")
-            ], className="mb-4"),
-            
-            dbc.Row([
-                # Tren Pembangkitan Volume
-                dbc.Col([
-                    dcc.Graph(
-                        id="line-chart-ebt-fossil-twh",
-                        figure=px.line(
-                            df_line_chart,
-                            x='year',
-                            y=['renewables_electricity', 'fossil_electricity'],
-                            title='Total Pembangkitan Listrik: EBT vs Fosil (TWh)',
-                            labels={'value': 'TWh', 'variable': 'Sumber Energi'},
-                            markers=True
-                        ).update_layout(hovermode="x unified", legend_title_text="Kategori")
-                    )
-                ], md=6, className="mb-3"),
-                
-                # Tren Surya dan Angin
-                dbc.Col([
-                    dcc.Graph(
-                        id="line-chart-solar-wind-twh",
-                        figure=px.line(
-                            df_line_chart,
-                            x='year',
-                            y=['solar_electricity', 'wind_electricity'],
-                            title='Tren Pertumbuhan Listrik Surya dan Angin di Indonesia (TWh)',
-                            labels={'value': 'TWh', 'variable': 'Sumber Energi'},
-                            markers=True
-                        ).update_layout(hovermode="x unified", legend_title_text="Kategori")
-                    )
-                ], md=6, className="mb-3")
-            ], className="mb-4"),
-            
-            html.Div([
-                html.P("Pangsa energi terbarukan dalam pembangkitan listrik Indonesia diprediksi hanya mencapai ~18.68% pada 2025, jauh di bawah target 23% pemerintah. Gap sebesar 4.32% menunjukkan perlunya akselerasi nyata dalam bauran energi bersih.", className="lead"),
-                html.P(html.B("Prioritaskan kebijakan dan investasi untuk mempercepat bauran energi bersih agar target 23% bisa lebih realistis dikejar."), className="text-primary")
-            ], className="mt-4 p-3 bg-light border rounded")
-        ])
-    
-    elif tab_selected == "tab-2-drivers":
-        return dbc.Container([
-            html.H2("Faktor Utama yang Memengaruhi Pertumbuhan EBT Tahunan", className="mb-4 text-center"),
-            dbc.Row([
-                dbc.Col([
-                    dcc.Graph(
-                        id="shap-summary-plot",
-                        figure=px.bar(
-                            x=[0.65, -0.77, -0.64, 0.45, -0.32],
-                            y=['share_hydro_in_renew', 'fossil_yoy_growth', 'carbon_intensity_elec', 'renewables_share_energy', 'fossil_share_elec'],
-                            orientation='h',
-                            title="Faktor Terpenting dalam Model Prediksi EBT",
-                            labels={'x': 'Koefisien/Pengaruh', 'y': 'Fitur'}
-                        )
-                    )
-                ], md=6, className="mb-3"),
-                dbc.Col([
-                    dcc.Graph(
-                        id="partial-dependence-plots",
-                        figure=px.scatter(
-                            df_line_chart,
-                            x='renewables_share_energy',
-                            y='renewables_yoy_growth',
-                            title="Partial Dependence: Pangsa EBT vs Pertumbuhan YoY"
-                        )
-                    )
-                ], md=6, className="mb-3"),
-            ], className="mb-4"),
+                md=6, className="mb-3"
+            ),
             
-            html.Div([
-                html.P("Model menyoroti 5 fitur paling berpengaruh terhadap pertumbuhan tahunan energi terbarukan: pangsa hidro dalam EBT (positif), pertumbuhan fosil (negatif), intensitas karbon listrik (negatif), pangsa EBT dalam energi total (positif), dan pangsa fosil dalam listrik (negatif).", className="lead"),
-                html.P(html.B("Fokus pada peningkatan pangsa energi terbarukan dalam total energi, serta penurunan intensitas karbon dan pertumbuhan fosil untuk mendorong pertumbuhan EBT yang lebih cepat."), className="text-primary")
-            ], className="mt-4 p-3 bg-light border rounded")
-        ])
-    
-    elif tab_selected == "tab-3-simulation":
-        return dbc.Container([
-            html.H2("Uji Dampak Skenario Kebijakan terhadap Pertumbuhan EBT", className="mb-4 text-center"),
-            dbc.Row([
-                dbc.Col([
-                    html.Label("Ubah Pangsa EBT dalam Energi Total (renewables_share_energy):"),
-                    dcc.Slider(
-                        id='slider-renewables-share',
-                        min=df['renewables_share_energy'].min(),
-                        max=df['renewables_share_energy'].max() + 5,
-                        step=0.1,
-                        value=df['renewables_share_energy'].iloc[-1],
-                        marks={i: str(i) for i in range(int(df['renewables_share_energy'].min()), int(df['renewables_share_energy'].max() + 6), 2)},
-                        tooltip={"placement": "bottom", "always_visible": True}
-                    )
-                ], md=12, className="mb-4")
-            ]),
-            dbc.Row([
-                dbc.Col([
-                    dcc.Graph(id="yoy-simulation-chart")
-                ], md=12, className="mb-4")
-            ]),
-            dbc.Row([
-                dbc.Col(dbc.Card([
-                    dbc.CardHeader("Hasil Simulasi: Prediksi YoY Growth"),
-                    dbc.CardBody(html.Div(id="simulation-results-display"))
-                ]), md=12, className="mb-3")
-            ], className="mb-4"),
+            # Line Chart Tren Utama
+            dbc.Col([
+                dcc.Graph(
+                    id="line-chart-ebt-share",
+                    figure=build_share_figure(snap.df_line_chart, series)
+                )
+            ], md=6, className="mb-3")
+        ], className="mb-4"),
+        
+        dbc.Row([
+            # Tren Pembangkitan Volume
+            dbc.Col([
+                dcc.Graph(
+                    id="line-chart-ebt-fossil-twh",
+                    figure=px.line(
+                        snap.df_line_chart,
+                        x='year',
+                        y=['renewables_electricity', 'fossil_electricity'],
+                        title='Total Pembangkitan Listrik: EBT vs Fosil (TWh)',
+                        labels={'value': 'TWh', 'variable': 'Sumber Energi'},
+                        markers=True
+                    ).update_layout(hovermode="x unified", legend_title_text="Kategori")
+                )
+            ], md=6, className="mb-3"),
             
-            html.Div([
-                html.P("Simulasi menunjukkan bahwa setiap kenaikan 1% pada pangsa EBT dalam energi total berpotensi meningkatkan pertumbuhan YoY hingga 0.5–0.7%. Perubahan kebijakan bisa diterjemahkan langsung ke dalam pertumbuhan.", className="lead"),
-                html.P(html.B("Gunakan insight ini untuk mengembangkan simulasi kebijakan, target pembangkit baru, dan peta jalan transisi energi."), className="text-primary")
-            ], className="mt-4 p-3 bg-light border rounded")
-        ])
-    
-    elif tab_selected == "tab-4-reliability":
-        return dbc.Container([
-            html.H2("Evaluasi Stabilitas dan Ketidakpastian Model Prediksi", className="mb-4 text-center"),
-            dbc.Row([
-                dbc.Col([
-                    dcc.Graph(
-                        id="confidence-band-plot",
-                        figure=go.Figure(data=[
-                            go.Scatter(x=[2024, 2025], y=[mean_preds_2024, mean_preds_2025], mode='lines+markers', name='Prediksi Rata-rata'),
-                            go.Scatter(
-                                x=[2024, 2025],
-                                y=[mean_preds_2024 - std_preds_2024, mean_preds_2025 - std_preds_2025],
-                                mode='lines',
-                                line=dict(width=0),
-                                showlegend=False
-                            ),
-                            go.Scatter(
-                                x=[2024, 2025],
-                                y=[mean_preds_2024 + std_preds_2024, mean_preds_2025 + std_preds_2025],
-                                mode='lines',
-                                fill='tonexty',
-                                fillcolor='rgba(0,100,80,0.2)',
-                                name='Confidence Band (±1 STD)',
-                                line=dict(width=0)
-                            )
-                        ], layout=go.Layout(
-                            title="Prediksi Pertumbuhan EBT YoY dengan Risiko (2024–2025)",
-                            xaxis_title="Tahun",
-                            yaxis_title="Prediksi Pertumbuhan YoY (%)"
-                        ))
-                    )
-                ], md=6, className="mb-3"),
-                dbc.Col([
-                    dcc.Graph(
-                        id="residual-plot",
-                        figure=px.histogram(
-                            x=np.random.normal(0, 1, 100),
-                            title="Distribusi Residual Model",
-                            labels={'x': 'Residual', 'y': 'Frekuensi'}
+            # Tren Surya dan Angin
+            dbc.Col([
+                dcc.Graph(
+                    id="line-chart-solar-wind-twh",
+                    figure=px.line(
+                        snap.df_line_chart,
+                        x='year',
+                        y=['solar_electricity', 'wind_electricity'],
+                        title='Tren Pertumbuhan Listrik Surya dan Angin di Indonesia (TWh)',
+                        labels={'value': 'TWh', 'variable': 'Sumber Energi'},
+                        markers=True
+                    ).update_layout(hovermode="x unified", legend_title_text="Kategori")
+                )
+            ], md=6, className="mb-3")
+        ], className="mb-4"),
+        
+        html.Div([
+            html.P(f"Pangsa energi terbarukan dalam pembangkitan listrik Indonesia diprediksi hanya mencapai ~{kpis['prediksi_pangsa_ebt_2025']:.2f}% pada 2025, jauh di bawah target 23% pemerintah. Gap sebesar {kpis['gap_menuju_target_2025']:.2f}% menunjukkan perlunya akselerasi nyata dalam bauran energi bersih.", className="lead"),
+            html.P(html.B("Prioritaskan kebijakan dan investasi untuk mempercepat bauran energi bersih agar target 23% bisa lebih realistis dikejar."), className="text-primary")
+        ], className="mt-4 p-3 bg-light border rounded")
+    ])
+
+ATTRIBUTION_LABELS = {
+    'renewables_yoy_growth': "Pertumbuhan EBT (YoY)",
+    'fossil_yoy_growth': "Pertumbuhan Fosil (YoY)",
+}
+DIRECTION_COLORS = {1: 'seagreen', -1: 'indianred', 0: 'gray'}
+DIRECTION_LABELS = {1: 'positif', -1: 'negatif', 0: 'netral'}
+TOP_FEATURES = 10
+
+def build_importance_figure(attribution):
+    """Rata-rata |SHAP| per fitur; tombol untuk berpindah antar model"""
+    fig = go.Figure()
+    targets = list(attribution)
+    for i, target in enumerate(targets):
+        top = attribution[target]['importance'][:TOP_FEATURES][::-1]
+        fig.add_trace(go.Bar(
+            x=[importance for _, importance, _ in top],
+            y=[name for name, _, _ in top],
+            orientation='h',
+            marker_color=[DIRECTION_COLORS[direction] for _, _, direction in top],
+            customdata=[DIRECTION_LABELS[direction] for _, _, direction in top],
+            hovertemplate="%{y}: %{x:.3f} (arah %{customdata})<extra></extra>",
+            name=ATTRIBUTION_LABELS.get(target, target),
+            visible=i == 0,
+        ))
+    fig.update_layout(
+        title="Faktor Terpenting dalam Model Prediksi EBT (SHAP)",
+        xaxis_title="Rata-rata |SHAP| (poin % YoY)",
+        yaxis_title="Fitur",
+        showlegend=False,
+        updatemenus=[dict(
+            type="buttons", direction="right", x=0, xanchor="left", y=1.12, yanchor="bottom",
+            buttons=[dict(label=ATTRIBUTION_LABELS.get(target, target), method="update",
+                          args=[{"visible": [j == i for j in range(len(targets))]}])
+                     for i, target in enumerate(targets)],
+        )] if len(targets) > 1 else [],
+    )
+    return fig
+
+def build_pdp_figure(result):
+    """Partial dependence model pertumbuhan EBT; dropdown untuk memilih fitur"""
+    order = [result['features'].index(name) for name, _, _ in result['importance'][:TOP_FEATURES]]
+    fig = go.Figure()
+    for i, j in enumerate(order):
+        fig.add_trace(go.Scatter(
+            x=result['pdp_grid'][j], y=result['pdp_values'][j],
+            mode='lines', name=result['features'][j], visible=i == 0,
+        ))
+    fig.update_layout(
+        title="Partial Dependence: Pengaruh Fitur terhadap Prediksi Pertumbuhan YoY EBT",
+        xaxis_title=result['features'][order[0]],
+        yaxis_title="Prediksi Pertumbuhan YoY (%)",
+        showlegend=False,
+        updatemenus=[dict(
+            direction="down", x=1, xanchor="right", y=1.12, yanchor="bottom",
+            buttons=[dict(label=result['features'][j], method="update",
+                          args=[{"visible": [k == i for k in range(len(order))]},
+                                {"xaxis.title.text": result['features'][j]}])
+                     for i, j in enumerate(order)],
+        )],
+    )
+    return fig
+
+def build_tab_drivers(snap):
+    attribution = snap.attribution
+    if 'renewables_yoy_growth' in attribution:
+        importance_figure = build_importance_figure(attribution)
+        pdp_figure = build_pdp_figure(attribution['renewables_yoy_growth'])
+        top = attribution['renewables_yoy_growth']['importance'][:5]
+        summary = ", ".join(f"{name} ({DIRECTION_LABELS[direction]})" for name, _, direction in top)
+        narrative = f"Berdasarkan nilai SHAP model Random Forest, 5 fitur paling berpengaruh terhadap pertumbuhan tahunan energi terbarukan adalah: {summary}."
+    else:
+        # Model tidak tersedia: tampilkan ringkasan hasil analisis sebelumnya
+        importance_figure = px.bar(
+            x=[0.65, -0.77, -0.64, 0.45, -0.32],
+            y=['share_hydro_in_renew', 'fossil_yoy_growth', 'carbon_intensity_elec', 'renewables_share_energy', 'fossil_share_elec'],
+            orientation='h',
+            title="Faktor Terpenting dalam Model Prediksi EBT",
+            labels={'x': 'Koefisien/Pengaruh', 'y': 'Fitur'}
+        )
+        pdp_figure = px.scatter(
+            snap.df_line_chart,
+            x='renewables_share_energy',
+            y='renewables_yoy_growth',
+            title="Pangsa EBT vs Pertumbuhan YoY (Data Historis)"
+        )
+        narrative = "Model menyoroti 5 fitur paling berpengaruh terhadap pertumbuhan tahunan energi terbarukan: pangsa hidro dalam EBT (positif), pertumbuhan fosil (negatif), intensitas karbon listrik (negatif), pangsa EBT dalam energi total (positif), dan pangsa fosil dalam listrik (negatif)."
+
+    return dbc.Container([
+        html.H2("Faktor Utama yang Memengaruhi Pertumbuhan EBT Tahunan", className="mb-4 text-center"),
+        dbc.Row([
+            dbc.Col([
+                dcc.Graph(
+                    id="shap-summary-plot",
+                    figure=importance_figure
+                )
+            ], md=6, className="mb-3"),
+            dbc.Col([
+                dcc.Graph(
+                    id="partial-dependence-plots",
+                    figure=pdp_figure
+                )
+            ], md=6, className="mb-3"),
+        ], className="mb-4"),
+        
+        html.Div([
+            html.P(narrative, className="lead"),
+            html.P(html.B("Fokus pada peningkatan pangsa energi terbarukan dalam total energi, serta penurunan intensitas karbon dan pertumbuhan fosil untuk mendorong pertumbuhan EBT yang lebih cepat."), className="text-primary")
+        ], className="mt-4 p-3 bg-light border rounded")
+    ])
+
+def build_tab_simulation(snap):
+    slider = snap.slider
+    return dbc.Container([
+        html.H2("Uji Dampak Skenario Kebijakan terhadap Pertumbuhan EBT", className="mb-4 text-center"),
+        dbc.Row([
+            dbc.Col([
+                html.Label("Ubah Pangsa EBT dalam Energi Total (renewables_share_energy):"),
+                dcc.Slider(
+                    id='slider-renewables-share',
+                    min=slider['min'],
+                    max=slider['max'],
+                    step=slider['step'],
+                    value=slider['value'],
+                    marks=slider['marks'],
+                    tooltip={"placement": "bottom", "always_visible": True}
+                )
+            ], md=12, className="mb-4")
+        ]),
+        dbc.Row([
+            dbc.Col([
+                dcc.Graph(id="yoy-simulation-chart")
+            ], md=12, className="mb-4")
+        ]),
+        # Tabel simulasi dikirim sekali ke browser untuk callback clientside
+        dcc.Store(id="simulation-table-store", data=simulation_store_data(snap) if CLIENTSIDE_SIMULATION else None),
+        dbc.Row([
+            dbc.Col(dbc.Card([
+                dbc.CardHeader("Hasil Simulasi: Prediksi YoY Growth"),
+                dbc.CardBody(html.Div(id="simulation-results-display"))
+            ]), md=12, className="mb-3")
+        ], className="mb-4"),
+        
+        html.Div([
+            html.P("Simulasi menunjukkan bahwa setiap kenaikan 1% pada pangsa EBT dalam energi total berpotensi meningkatkan pertumbuhan YoY hingga 0.5–0.7%. Perubahan kebijakan bisa diterjemahkan langsung ke dalam pertumbuhan.", className="lead"),
+            html.P(html.B("Gunakan insight ini untuk mengembangkan simulasi kebijakan, target pembangkit baru, dan peta jalan transisi energi."), className="text-primary")
+        ], className="mt-4 p-3 bg-light border rounded")
+    ])
+
+def build_tab_reliability(snap):
+    reliability = snap.reliability
+    return dbc.Container([
+        html.H2("Evaluasi Stabilitas dan Ketidakpastian Model Prediksi", className="mb-4 text-center"),
+        dbc.Row([
+            dbc.Col([
+                dcc.Graph(
+                    id="confidence-band-plot",
+                    figure=go.Figure(data=[
+                        go.Scatter(x=reliability['years'], y=reliability['mean'], mode='lines+markers', name='Prediksi Rata-rata'),
+                        go.Scatter(
+                            x=reliability['years'],
+                            y=reliability['band_lower'],
+                            mode='lines',
+                            line=dict(width=0),
+                            showlegend=False
+                        ),
+                        go.Scatter(
+                            x=reliability['years'],
+                            y=reliability['band_upper'],
+                            mode='lines',
+                            fill='tonexty',
+                            fillcolor='rgba(0,100,80,0.2)',
+                            name=reliability['band_label'],
+                            line=dict(width=0)
                         )
+                    ], layout=go.Layout(
+                        title="Prediksi Pertumbuhan EBT YoY dengan Risiko (2024–2025)",
+                        xaxis_title="Tahun",
+                        yaxis_title="Prediksi Pertumbuhan YoY (%)"
+                    ))
+                )
+            ], md=6, className="mb-3"),
+            dbc.Col([
+                dcc.Graph(
+                    id="residual-plot",
+                    figure=px.histogram(
+                        x=reliability['residuals'],
+                        title=reliability['residual_title'],
+                        labels={'x': 'Residual', 'y': 'Frekuensi'}
                     )
-                ], md=6, className="mb-3")
-            ], className="mb-4"),
+                )
+            ], md=6, className="mb-3")
+        ], className="mb-4"),
+
+        # Sweep dihitung di proses latar belakang; progres diperbarui lewat polling
+        html.Div([
+            html.H4("Sweep Ketidakpastian terhadap Pangsa EBT"),
+            html.P("Hitung sebaran prediksi antar pohon RF untuk seluruh rentang pangsa EBT dalam energi."),
+            dbc.Button("Hitung Sweep", id="sweep-button", color="primary", className="me-2"),
+            dbc.Button("Batal", id="sweep-cancel-button", color="secondary", outline=True, disabled=True),
+            html.Progress(id="sweep-progress", value="0", max=str(SWEEP_POINTS), className="w-100 mt-3"),
+            html.Div(id="sweep-output", className="mt-3"),
+        ], className="mb-4"),
+        
+        html.Div([
+            html.P(f"Model memiliki ketidakpastian ±{reliability['std'][-1]:.2f}% pada prediksi pertumbuhan EBT tahunan. Ini mencerminkan volatilitas tinggi pada variabel renewables_yoy_growth. Residual plot menunjukkan pola yang masih belum sepenuhnya ditangkap model.", className="lead"),
+            html.P(html.B("Gunakan hasil prediksi sebagai indikasi arah, bukan angka absolut. Selalu padukan dengan pertimbangan kebijakan dan faktor eksternal."), className="text-primary")
+        ], className="mt-4 p-3 bg-light border rounded")
+    ])
+
+MODEL_LABELS = {'renewables_share_elec': "Pangsa EBT", **ATTRIBUTION_LABELS}
+
+def build_metrics_table(metrics):
+    """Metrik validasi silang (TimeSeriesSplit) model RF dari train.py"""
+    return dbc.Table.from_dataframe(pd.DataFrame({
+        'Model': [MODEL_LABELS.get(target, target) for target in metrics],
+        'MAE (CV)': [round(m['mae'], 3) for m in metrics.values()],
+        'RMSE (CV)': [round(m['rmse'], 3) for m in metrics.values()],
+        'R² (CV)': [round(m['r2'], 3) for m in metrics.values()],
+    }), striped=True, bordered=True, hover=True, className="mt-3 mb-4")
+
+def build_tab_methodology(snap):
+    methodology = snap.methodology
+    return dbc.Container([
+        html.H2("Metodologi Analisis dan Sumber Data", className="mb-4 text-center"),
+        html.Div([
+            html.H4("Pendekatan Analisis Data"),
+            html.P("Proyek ini melalui tahapan Pemahaman Bisnis, Pemahaman Data, Persiapan Data, Pemodelan, dan Evaluasi untuk memastikan analisis yang komprehensif dan insight yang dapat ditindaklanjuti."),
+
+            html.H4("Sumber Data"),
+            html.P("Analisis ini berbasis pada data Our World in Data (OWID) untuk Indonesia (1985–2023).", className="mb-3"),
+
+            html.H4("Persiapan Data"),
+            html.P("Data dibersihkan dari missing values, dengan feature engineering untuk membuat kolom turunan relevan seperti pertumbuhan YoY dan pangsa per sumber EBT."),
+
+            html.H4("Pemodelan & Validasi"),
+            html.P("Model prediksi utama menggunakan Random Forest. Model Linear, Polynomial, Lasso, Ridge, dan EBM juga digunakan untuk evaluasi dan validasi silang."),
             
-            html.Div([
-                html.P(f"Model memiliki ketidakpastian ±{std_preds_2025:.2f}% pada prediksi pertumbuhan EBT tahunan. Ini mencerminkan volatilitas tinggi pada variabel renewables_yoy_growth. Residual plot menunjukkan pola yang masih belum sepenuhnya ditangkap model.", className="lead"),
-                html.P(html.B("Gunakan hasil prediksi sebagai indikasi arah, bukan angka absolut. Selalu padukan dengan pertimbangan kebijakan dan faktor eksternal."), className="text-primary")
-            ], className="mt-4 p-3 bg-light border rounded")
-        ])
-    
-    elif tab_selected == "tab-5-methodology":
-        return dbc.Container([
-            html.H2("Metodologi Analisis dan Sumber Data", className="mb-4 text-center"),
-            html.Div([
-                html.H4("Pendekatan Analisis Data"),
-                html.P("Proyek ini melalui tahapan Pemahaman Bisnis, Pemahaman Data, Persiapan Data, Pemodelan, dan Evaluasi untuk memastikan analisis yang komprehensif dan insight yang dapat ditindaklanjuti."),
-
-                html.H4("Sumber Data"),
-                html.P("Analisis ini berbasis pada data Our World in Data (OWID) untuk Indonesia (1985–2023).", className="mb-3"),
-
-                html.H4("Persiapan Data"),
-                html.P("Data dibersihkan dari missing values, dengan feature engineering untuk membuat kolom turunan relevan seperti pertumbuhan YoY dan pangsa per sumber EBT."),
-
-                html.H4("Pemodelan & Validasi"),
-                html.P("Model prediksi utama menggunakan Random Forest. Model Linear, Polynomial, Lasso, Ridge, dan EBM juga digunakan untuk evaluasi dan validasi silang."),
-                
-                # Tabel perbandingan model
-                dbc.Table.from_dataframe(pd.DataFrame({
-                    'Feature': ['share_hydro_in_renew', 'fossil_yoy_growth', 'carbon_intensity_elec'],
-                    'Lasso Coef': [0.650, -0.774, -0.643],
-                    'Ridge Coef': [1.598, -0.993, -1.198]
-                }), striped=True, bordered=True, hover=True, className="mt-3 mb-4"),
-
-                html.H4("Insight Utama"),
-                html.P("Target 23% EBT 2025 kemungkinan tidak tercapai dengan laju pertumbuhan saat ini. Model menunjukkan konsistensi fitur penting yang memberikan dasar kuat untuk rekomendasi kebijakan."),
-            ], className="mt-4 p-3 bg-light border rounded")
-        ])
-    
-    return html.Div("Pilih tab untuk menampilkan konten.")
+            # Tabel perbandingan model
+            dbc.Table.from_dataframe(pd.DataFrame(methodology['linear_coefficients']),
+                                     striped=True, bordered=True, hover=True, className="mt-3 mb-4"),
+            *([build_metrics_table(methodology['metrics'])] if methodology['metrics'] else []),
 
-# Callback untuk simulasi
+            html.H4("Insight Utama"),
+            html.P("Target 23% EBT 2025 kemungkinan tidak tercapai dengan laju pertumbuhan saat ini. Model menunjukkan konsistensi fitur penting yang memberikan dasar kuat untuk rekomendasi kebijakan."),
+        ], className="mt-4 p-3 bg-light border rounded")
+    ])
+
+TAB_BUILDERS = {
+    "tab-1-overview": build_tab_overview,
+    "tab-2-drivers": build_tab_drivers,
+    "tab-3-simulation": build_tab_simulation,
+    "tab-4-reliability": build_tab_reliability,
+    "tab-5-methodology": build_tab_methodology,
+}
+
+# Tab bergantung pada nilai turunan berikut; tab hanya dibangun ulang bila
+# salah satu nilainya berubah
+TAB_DEPENDENCIES = {
+    "tab-1-overview": ('kpis', 'predictions', 'series', 'df_line_chart'),
+    "tab-2-drivers": ('df_line_chart', 'attribution'),
+    "tab-3-simulation": ('slider', 'simulation_table'),
+    "tab-4-reliability": ('reliability',),
+    "tab-5-methodology": ('methodology',),
+}
+
+# --- 4. Cache Figure ---
+# Konten tab hanya bergantung pada data dan nilai prediksi, jadi cukup dibangun
+# sekali per versi data lalu dikirim ulang dalam bentuk JSON yang sudah jadi
+figure_cache = FigureCache()
+
+def tab_builder(tab, snap):
+    # Snapshot dari bundle startup hanya berisi versi; bila tab belum ada di
+    # cache, tunggu snapshot lengkap dari data dan model
+    return lambda: TAB_BUILDERS[tab](snap if snap.complete else state.ready())
+
+def cached_tab(tab, snap):
+    with timed('lookup'):
+        version = snap.version_of(*TAB_DEPENDENCIES[tab])
+    return figure_cache.respond(tab, version, tab_builder(tab, snap))
+
+def warm_figure_cache(snap):
+    for tab in TAB_BUILDERS:
+        figure_cache.get(tab, snap.version_of(*TAB_DEPENDENCIES[tab]), tab_builder(tab, snap))
+
+# --- Callback untuk Mengganti Konten Tab ---
 @app.callback(
-    [Output("yoy-simulation-chart", "figure"),
-     Output("simulation-results-display", "children")],
-    [Input('slider-renewables-share', 'value')]
+    Output("tab-content", "children"),
+    Input("main-tabs", "value")
+)
+@instrument_callback
+def render_tab_content(tab_selected):
+    if tab_selected not in TAB_BUILDERS:
+        return html.Div("Pilih tab untuk menampilkan konten.")
+    set_labels(tab=tab_selected)
+    return cached_tab(tab_selected, state.current)
+
+# --- 5. API Evaluasi Skenario (batch) ---
+server.register_blueprint(create_scenario_blueprint(lambda: state.ready().scenario_evaluator))
+
+@server.route("/_figure-cache/stats")
+def figure_cache_stats():
+    stats = figure_cache.stats()
+    if compressor is not None:
+        stats["compression"] = compressor.stats()
+    return jsonify(stats)
+
+# Callback untuk simulasi
+SIMULATION_LAYOUT = dict(
+    title="Perbandingan Prediksi YoY Growth: Baseline vs Simulasi",
+    xaxis_title="Tahun",
+    yaxis_title="Pertumbuhan YoY (%)"
 )
+
+def simulation_store_data(snap):
+    """Tabel simulasi untuk callback clientside, ditambah layout figure"""
+    # Layout lengkap (termasuk template) agar tampilan sama dengan versi server
+    return {**snap.simulation_table, 'layout': go.Figure(layout=SIMULATION_LAYOUT).to_plotly_json()['layout']}
+
 def update_simulation(renewables_share_value):
-    # Simulasi sederhana: asumsi setiap 1% kenaikan renewables_share_energy = 0.6% kenaikan YoY growth
-    base_yoy = pred_yoy_ebt_2025
-    current_share = df['renewables_share_energy'].iloc[-1]
-    simulated_yoy = base_yoy + (renewables_share_value - current_share) * 0.6
+    with timed('lookup'):
+        snap = state.ready()
+        simulation_surface, baseline = snap.simulation_surface, snap.simulation_baseline
+        base_yoy = baseline[2025]
+        if simulation_surface is not None:
+            # Dampak dari model RF: selisih prediksi terhadap pangsa EBT saat ini
+            simulated_yoy = base_yoy + simulation_surface.delta(renewables_share_value)
+        else:
+            # Simulasi sederhana: asumsi setiap 1% kenaikan renewables_share_energy = 0.6% kenaikan YoY growth
+            simulated_yoy = base_yoy + (renewables_share_value - snap.slider['value']) * 0.6
     
     # Buat chart simulasi
+    with timed('figure'):
+        return build_simulation_figure(renewables_share_value, baseline, base_yoy, simulated_yoy)
+
+def build_simulation_figure(renewables_share_value, baseline, base_yoy, simulated_yoy):
     fig = go.Figure()
     fig.add_trace(go.Scatter(
         x=[2024, 2025],
-        y=[pred_yoy_ebt_2024, base_yoy],
+        y=[baseline[2024], base_yoy],
         mode='lines+markers',
         name='Prediksi Baseline',
         line=dict(color='blue')
     ))
     fig.add_trace(go.Scatter(
         x=[2024, 2025],
-        y=[pred_yoy_ebt_2024, simulated_yoy],
+        y=[baseline[2024], simulated_yoy],
         mode='lines+markers',
         name='Simulasi dengan Perubahan',
         line=dict(color='red', dash='dash')
     ))
-    fig.update_layout(
-        title="Perbandingan Prediksi YoY Growth: Baseline vs Simulasi",
-        xaxis_title="Tahun",
-        yaxis_title="Pertumbuhan YoY (%)"
-    )
+    fig.update_layout(**SIMULATION_LAYOUT)
     
     # Hasil simulasi
     impact = simulated_yoy - base_yoy
@@ -417,6 +551,124 @@ def update_simulation(renewables_share_value):
     
     return fig, result_text
 
+if CLIENTSIDE_SIMULATION:
+    # Grafik dan teks dihitung di browser dari tabel pada simulation-table-store
+    app.clientside_callback(
+        ClientsideFunction(namespace="simulation", function_name="update"),
+        [Output("yoy-simulation-chart", "figure"),
+         Output("simulation-results-display", "children")],
+        [Input('slider-renewables-share', 'value')],
+        [State('simulation-table-store', 'data')]
+    )
+else:
+    app.callback(
+        [Output("yoy-simulation-chart", "figure"),
+         Output("simulation-results-display", "children")],
+        [Input('slider-renewables-share', 'value')]
+    )(instrument_callback(update_simulation))
+
+# Callback untuk sweep ketidakpastian (berjalan di proses latar belakang)
+SWEEP_POINTS = 200
+
+def run_uncertainty_sweep(set_progress, n_clicks):
+    if not n_clicks:
+        raise PreventUpdate
+    snap = state.ready()
+    if snap.simulation_surface is None:
+        return html.P("Model RF tidak tersedia; sweep ketidakpastian tidak dapat dihitung.")
+
+    yoy_model = snap.models['renewables_yoy_growth']
+    values = np.linspace(snap.slider['min'], snap.slider['max'], SWEEP_POINTS)
+    X = scenario_features(snap.df.iloc[-1], {'renewables_share_energy': values})[list(yoy_model.feature_names_in_)]
+    progress = None if set_progress is None else lambda done, total: set_progress((str(done), str(total)))
+    result = uncertainty_sweep(forest_arrays(model_path('renewables_yoy_growth')), X, progress=progress)
+
+    q05, q25, _, q75, q95 = result['quantiles']
+    fig = go.Figure([
+        go.Scatter(x=values, y=q05, mode='lines', line=dict(width=0), showlegend=False),
+        go.Scatter(x=values, y=q95, mode='lines', line=dict(width=0), fill='tonexty',
+                   fillcolor='rgba(0,100,80,0.15)', name='Kuantil 5–95 antar Pohon'),
+        go.Scatter(x=values, y=q25, mode='lines', line=dict(width=0), showlegend=False),
+        go.Scatter(x=values, y=q75, mode='lines', line=dict(width=0), fill='tonexty',
+                   fillcolor='rgba(0,100,80,0.3)', name='Kuantil 25–75 antar Pohon'),
+        go.Scatter(x=values, y=result['mean'], mode='lines', name='Prediksi Rata-rata', line=dict(color='green')),
+    ])
+    fig.update_layout(
+        title="Ketidakpastian Prediksi YoY Growth EBT terhadap Pangsa EBT dalam Energi",
+        xaxis_title="Pangsa EBT dalam Energi (%)",
+        yaxis_title="Prediksi Pertumbuhan YoY (%)",
+    )
+    return dcc.Graph(figure=fig)
+
+def run_uncertainty_sweep_sync(n_clicks):
+    return run_uncertainty_sweep(None, n_clicks)
+
+# Hasil disimpan per versi data dan model, jadi klik berikutnya langsung dari cache;
+# n_clicks (argumen 0) tidak ikut kunci cache agar klik ke-2 dst. memakai hasil yang sama
+background_manager = create_background_manager(cache_by=[lambda: state.current.version_of('df', 'models')])
+
+if background_manager is not None:
+    app.callback(
+        Output("sweep-output", "children"),
+        Input("sweep-button", "n_clicks"),
+        background=True,
+        manager=background_manager,
+        cache_args_to_ignore=[0],
+        progress=[Output("sweep-progress", "value"), Output("sweep-progress", "max")],
+        running=[
+            (Output("sweep-button", "disabled"), True, False),
+            (Output("sweep-cancel-button", "disabled"), False, True),
+        ],
+        cancel=[Input("sweep-cancel-button", "n_clicks")],
+        interval=500,
+        prevent_initial_call=True,
+    )(run_uncertainty_sweep)
+else:
+    # Tanpa diskcache (atau BACKGROUND_CALLBACKS=0) sweep berjalan di request biasa
+    app.callback(
+        Output("sweep-output", "children"),
+        Input("sweep-button", "n_clicks"),
+        prevent_initial_call=True,
+    )(instrument_callback(run_uncertainty_sweep_sync))
+
+# --- 6. Snapshot Data dan Hot Reload ---
+# Semua nilai turunan (KPI, series, tabel simulasi, ...) ada di satu snapshot.
+# Watcher menukar snapshot saat file di data/ atau models/ berubah.
+# Dengan FAST_START=1 konten tab diambil dari bundle startup yang sudah jadi
+# (python startup_bundle.py build); data dan model dimuat di latar belakang.
+# Bila app di-preload gunicorn, data dan model tetap dimuat di master agar
+# dibagi ke worker lewat copy-on-write; bundle hanya melewati pembangunan figure.
+FAST_START = os.environ.get('FAST_START', '0') == '1'
+PRELOADED = os.environ.get('DASHBOARD_PRELOADED') == '1'
+startup_bundle = load_bundle() if FAST_START else None
+if startup_bundle is not None:
+    figure_cache.load(startup_bundle['figures'])
+if startup_bundle is not None and not PRELOADED:
+    state = create_state(initial=Snapshot({}, startup_bundle['versions'], complete=False))
+else:
+    state = create_state()
+watcher = create_watcher(state, interval=float(os.environ.get('HOT_RELOAD_INTERVAL', 5)))
+
+def start_background_tasks():
+    """Dipanggil saat import, atau dari post_fork gunicorn bila app di-preload"""
+    # Encoder JSON plotly memeriksa pandas lewat sys.modules; pandas yang masih
+    # setengah diimpor oleh thread pemuat membuat serialisasi layout gagal
+    import_now(pd)
+    state.load_in_background()
+    if os.environ.get('HOT_RELOAD', '0') == '1':
+        watcher.start()
+
+if os.environ.get('FIGURE_CACHE_WARM', '1') == '1':
+    # Bangun semua tab di awal agar request pertama langsung dilayani dari cache,
+    # dan bangun ulang tab yang terdampak setiap kali snapshot diganti
+    if state.current.complete:
+        with timed('warm_figure_cache'):
+            warm_figure_cache(state.current)
+    state.listeners.append(warm_figure_cache)
+
+if not PRELOADED:
+    start_background_tasks()
+
 # --- Jalankan Aplikasi ---
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 8050))
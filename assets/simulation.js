@@ -0,0 +1,52 @@
+// Simulasi skenario di browser: menghitung grafik dan teks dari tabel
+// prediksi yang dikirim sekali lewat simulation-table-store.
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    simulation: {
+        update: function(shareValue, table) {
+            if (!table || shareValue === undefined || shareValue === null) {
+                return [window.dash_clientside.no_update, window.dash_clientside.no_update];
+            }
+
+            var delta;
+            if (table.deltas) {
+                // Lookup O(1) ke grid prediksi model RF
+                var index = Math.round((shareValue - table.start) / table.step);
+                index = Math.min(Math.max(index, 0), table.deltas.length - 1);
+                delta = table.deltas[index];
+            } else {
+                delta = (shareValue - table.current_share) * table.fallback_slope;
+            }
+
+            var baseYoy = table.base_2025;
+            var simulatedYoy = baseYoy + delta;
+            var figure = {
+                data: [
+                    {
+                        type: 'scatter',
+                        x: [2024, 2025],
+                        y: [table.base_2024, baseYoy],
+                        mode: 'lines+markers',
+                        name: 'Prediksi Baseline',
+                        line: {color: 'blue'}
+                    },
+                    {
+                        type: 'scatter',
+                        x: [2024, 2025],
+                        y: [table.base_2024, simulatedYoy],
+                        mode: 'lines+markers',
+                        name: 'Simulasi dengan Perubahan',
+                        line: {color: 'red', dash: 'dash'}
+                    }
+                ],
+                layout: table.layout
+            };
+
+            var impact = simulatedYoy - baseYoy;
+            var resultText = 'Dengan pangsa EBT ' + shareValue.toFixed(1) +
+                '%, prediksi YoY growth 2025 menjadi ' + simulatedYoy.toFixed(2) +
+                '% (dampak: ' + (impact >= 0 ? '+' : '') + impact.toFixed(2) + '%)';
+
+            return [figure, resultText];
+        }
+    }
+});
@@ -0,0 +1,162 @@
+# attribution.py
+"""Atribusi fitur (TreeSHAP) dan partial dependence dari model RF.
+
+Nilai SHAP dihitung dengan algoritma TreeSHAP (path-dependent, Lundberg dkk.)
+langsung di atas ForestArrays; `cover` setiap node dipakai sebagai proporsi
+data yang melewati cabang. Partial dependence seluruh fitur dihitung dalam satu
+panggilan `predict`. Hasil disimpan di disk dengan kunci hash model dan data.
+"""
+import hashlib
+import os
+
+import numpy as np
+
+from lazy import LazyModule
+from model_store import artifact_cache_dir, file_hash, forest_arrays, prune_artifacts
+
+pd = LazyModule('pandas')
+
+PDP_GRID_POINTS = 30
+
+
+def _extend(path, zero_fraction, one_fraction, feature):
+    """EXTEND pada TreeSHAP: tambah satu fitur ke jalur dan perbarui bobot permutasi"""
+    depth = len(path)
+    path = [list(element) for element in path]
+    path.append([feature, zero_fraction, one_fraction, 1.0 if depth == 0 else 0.0])
+    for i in range(depth - 1, -1, -1):
+        path[i + 1][3] += one_fraction * path[i][3] * (i + 1) / (depth + 1)
+        path[i][3] = zero_fraction * path[i][3] * (depth - i) / (depth + 1)
+    return path
+
+
+def _unwind(path, index):
+    """UNWIND pada TreeSHAP: kebalikan EXTEND untuk elemen jalur ke-`index`"""
+    depth = len(path) - 1
+    _, zero_fraction, one_fraction, _ = path[index]
+    weights = [element[3] for element in path]
+    n = weights[depth]
+    for j in range(depth - 1, -1, -1):
+        if one_fraction != 0:
+            t = weights[j]
+            weights[j] = n * (depth + 1) / ((j + 1) * one_fraction)
+            n = t - weights[j] * zero_fraction * (depth - j) / (depth + 1)
+        else:
+            weights[j] = weights[j] * (depth + 1) / (zero_fraction * (depth - j))
+    unwound = [list(element) for element in path[:index] + path[index + 1:]]
+    for element, weight in zip(unwound, weights):
+        element[3] = weight
+    return unwound
+
+
+def _tree_shap(tree, x, phi):
+    """Tambahkan nilai SHAP satu pohon untuk satu baris `x` ke `phi`"""
+    feature, threshold, left, right, value, cover = tree
+
+    def recurse(node, path, zero_fraction, one_fraction, split_feature):
+        path = _extend(path, zero_fraction, one_fraction, split_feature)
+        if left[node] == node:  # daun
+            for i in range(1, len(path)):
+                weight = sum(element[3] for element in _unwind(path, i))
+                phi[path[i][0]] += weight * (path[i][2] - path[i][1]) * value[node]
+            return
+
+        f = feature[node]
+        hot, cold = (left[node], right[node]) if x[f] <= threshold[node] else (right[node], left[node])
+        incoming_zero, incoming_one = 1.0, 1.0
+        for k in range(1, len(path)):
+            if path[k][0] == f:
+                # Fitur yang sama sudah terpakai di atas: gabungkan lalu hapus dari jalur
+                incoming_zero, incoming_one = path[k][1], path[k][2]
+                path = _unwind(path, k)
+                break
+        recurse(hot, path, incoming_zero * cover[hot] / cover[node], incoming_one, f)
+        recurse(cold, path, incoming_zero * cover[cold] / cover[node], 0.0, f)
+
+    recurse(0, [], 1.0, 1.0, -1)
+
+
+def tree_shap_values(forest, X):
+    """Nilai SHAP rata-rata seluruh pohon: (n_baris, n_fitur), dan nilai dasar (expected value).
+
+    Untuk setiap baris berlaku: nilai dasar + jumlah SHAP = prediksi forest.
+    """
+    # sklearn membandingkan fitur dalam float32
+    X = np.asarray(X, dtype=np.float32).astype(np.float64)
+    phi = np.zeros(X.shape)
+    for t in range(forest.n_trees):
+        tree = tuple(np.asarray(getattr(forest, name)[t]).tolist() for name in forest.FIELDS)
+        for row in range(len(X)):
+            _tree_shap(tree, X[row], phi[row])
+    expected_value = float(np.mean(forest.value[:, 0]))
+    return phi / forest.n_trees, expected_value
+
+
+def partial_dependence(model, X, grid_points=PDP_GRID_POINTS):
+    """Partial dependence setiap fitur pada grid nilai (min-maks data).
+
+    Semua kombinasi (fitur, titik grid, baris) disusun menjadi satu matriks dan
+    diprediksi dalam satu panggilan `predict`, tanpa loop per titik.
+    """
+    X = np.asarray(X, dtype=float)
+    n_rows, n_features = X.shape
+    grid = np.linspace(X.min(axis=0), X.max(axis=0), grid_points).T  # (n_fitur, n_grid)
+
+    batch = np.broadcast_to(X, (n_features, grid_points, n_rows, n_features)).copy()
+    features = np.arange(n_features)
+    batch[features, :, :, features] = grid[:, :, None]
+    batch = batch.reshape(-1, n_features)
+    if hasattr(model, 'feature_names_in_'):
+        batch = pd.DataFrame(batch, columns=model.feature_names_in_)
+    predictions = model.predict(batch)
+    return grid, predictions.reshape(n_features, grid_points, n_rows).mean(axis=2)
+
+
+def compute_attribution(model, path, X):
+    """SHAP dan partial dependence untuk model dan data `X`, di-cache di disk.
+
+    Kunci cache adalah hash file model dan hash isi `X`, sehingga hanya dihitung
+    ulang bila model atau data berubah.
+    """
+    X = np.ascontiguousarray(X, dtype=float)
+    model_key = file_hash(path)[:16]
+    cache_path = os.path.join(
+        artifact_cache_dir(),
+        f"attribution-{model_key}-{hashlib.sha256(X.tobytes()).hexdigest()[:12]}.npz",
+    )
+    if os.path.exists(cache_path):
+        with np.load(cache_path) as data:
+            return {key: data[key] for key in data.files}
+
+    shap_values, expected_value = tree_shap_values(forest_arrays(path), X)
+    pdp_grid, pdp_values = partial_dependence(model, X)
+    result = {
+        'shap_values': shap_values,
+        'expected_value': np.array(expected_value),
+        'pdp_grid': pdp_grid,
+        'pdp_values': pdp_values,
+    }
+    tmp_path = cache_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, **result)
+    os.replace(tmp_path, cache_path)
+    # Hasil model yang sama untuk data lama tidak akan dipakai lagi
+    name = os.path.basename(cache_path)
+    prune_artifacts(f"attribution-{model_key}-*.npz", lambda other: other == name)
+    return result
+
+
+def feature_importance(features, X, shap_values):
+    """Fitur diurutkan dari rata-rata |SHAP| terbesar, beserta arah pengaruhnya.
+
+    Arah = tanda korelasi antara nilai fitur dan nilai SHAP-nya (+1, -1, atau 0).
+    """
+    X = np.asarray(X, dtype=float)
+    summary = []
+    for j, name in enumerate(features):
+        column, contribution = X[:, j], shap_values[:, j]
+        direction = 0
+        if column.std() > 0 and contribution.std() > 0:
+            direction = int(np.sign(np.corrcoef(column, contribution)[0, 1]))
+        summary.append((name, float(np.abs(contribution).mean()), direction))
+    return sorted(summary, key=lambda item: item[1], reverse=True)
@@ -0,0 +1,91 @@
+# background_jobs.py
+"""Callback berat (sweep ketidakpastian, dsb.) dijalankan di proses terpisah.
+
+Memakai `DiskcacheManager` bawaan Dash: antrean dan hasil disimpan di disk
+(ARTIFACT_CACHE_DIR/background), tanpa Redis atau Celery. Worker gunicorn
+hanya memulai job lalu melayani polling, sehingga request lain tidak tertahan.
+
+Tambahan di atas manager bawaan:
+- request identik yang datang saat job masih berjalan ikut menunggu job yang
+  sama (tidak memulai proses baru);
+- hasil yang sudah selesai disimpan per versi data/model dan dipakai ulang
+  tanpa menjalankan proses sama sekali.
+"""
+import os
+
+from model_store import artifact_cache_dir
+
+try:
+    import diskcache
+    from dash import DiskcacheManager
+    import multiprocess  # noqa: F401  (dibutuhkan DiskcacheManager)
+    import psutil  # noqa: F401
+except ImportError:  # tanpa paket ini callback berat berjalan sinkron seperti biasa
+    diskcache = None
+    DiskcacheManager = object
+
+BACKGROUND_CALLBACKS = os.environ.get('BACKGROUND_CALLBACKS', '1') == '1'
+# Lama hasil job disimpan untuk dipakai ulang (detik)
+RESULT_TTL = int(os.environ.get('BACKGROUND_RESULT_TTL', 24 * 3600))
+# Batas waktu penanda job yang sedang berjalan
+JOB_TIMEOUT = 3600
+
+# Penanda "hasil sudah di cache": tidak ada proses yang perlu dipantau
+CACHED_JOB = 0
+
+
+class SharedDiskcacheManager(DiskcacheManager):
+    """DiskcacheManager yang berbagi job untuk request identik dan memakai ulang hasil"""
+
+    def _inflight_key(self, key):
+        return f"{key}-inflight"
+
+    def _waiters_key(self, job):
+        return f"job-{job}-waiters"
+
+    def call_job_fn(self, key, job_fn, args, context):
+        if self.result_ready(key):
+            return CACHED_JOB
+        # Lock berbasis key di diskcache, berlaku lintas worker gunicorn
+        with diskcache.Lock(self.handle, f"{key}-lock", expire=60):
+            job = self.handle.get(self._inflight_key(key))
+            if job is None or not self.job_running(job):
+                if self.result_ready(key):
+                    return CACHED_JOB
+                job = super().call_job_fn(key, job_fn, args, context)
+                self.handle.set(self._inflight_key(key), job, expire=JOB_TIMEOUT)
+            self.handle.incr(self._waiters_key(job), default=0)
+            self.handle.touch(self._waiters_key(job), expire=JOB_TIMEOUT)
+        return job
+
+    def terminate_job(self, job):
+        # Dipanggil saat hasil diambil atau request dibatalkan: proses baru
+        # dihentikan setelah semua yang menunggu job ini selesai/membatalkan
+        if job is None or int(job) <= CACHED_JOB:
+            return
+        remaining = self.handle.decr(self._waiters_key(job), default=1)
+        if remaining > 0:
+            return
+        self.handle.delete(self._waiters_key(job))
+        super().terminate_job(job)
+
+    def job_running(self, job):
+        if job is None or int(job) <= CACHED_JOB:
+            return False
+        return super().job_running(job)
+
+    def get_progress(self, key):
+        # Tidak dihapus setelah dibaca agar semua yang menunggu job ini melihat progres
+        return self.handle.get(self._make_progress_key(key))
+
+
+def create_background_manager(cache_by):
+    """Manager untuk background callback, atau None bila dimatikan/dependensi tidak ada.
+
+    `cache_by` berisi fungsi tanpa argumen (misalnya versi data dan model)
+    yang ikut membentuk kunci cache hasil.
+    """
+    if not BACKGROUND_CALLBACKS or diskcache is None:
+        return None
+    cache = diskcache.Cache(os.path.join(artifact_cache_dir(), 'background'))
+    return SharedDiskcacheManager(cache, cache_by=cache_by, expire=RESULT_TTL)
@@ -0,0 +1,190 @@
+# benchmark.py
+"""Benchmark latensi dan ukuran payload callback Dash.
+
+Menjalankan `render_tab_content` untuk semua tab dan `update_simulation`
+di sepanjang rentang slider lewat test client Flask (tanpa browser/jaringan),
+lalu mencatat p50/p95/p99 latensi, throughput, ukuran respons, dan puncak
+memori. Hasil ditulis ke JSON dan dibandingkan dengan baseline:
+
+    python benchmark.py --save-baseline      # simpan baseline
+    python benchmark.py --threshold 0.25     # gagal (exit 1) bila regresi > 25%
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+# Callback simulasi harus berjalan di server agar bisa diukur
+os.environ['CLIENTSIDE_SIMULATION'] = '0'
+
+DEFAULT_OUTPUT = 'benchmark-results.json'
+DEFAULT_BASELINE = 'benchmark-baseline.json'
+
+# Metrik yang semakin besar semakin buruk, dan sebaliknya
+HIGHER_IS_WORSE = ('p50_ms', 'p95_ms', 'p99_ms', 'bytes', 'peak_memory_kb')
+LOWER_IS_WORSE = ('throughput_rps',)
+
+
+def tab_request(tab):
+    return {
+        'output': 'tab-content.children',
+        'outputs': {'id': 'tab-content', 'property': 'children'},
+        'inputs': [{'id': 'main-tabs', 'property': 'value', 'value': tab}],
+        'changedPropIds': ['main-tabs.value'],
+        'state': [],
+    }
+
+
+def simulation_request(value):
+    return {
+        'output': '..yoy-simulation-chart.figure...simulation-results-display.children..',
+        'outputs': [
+            {'id': 'yoy-simulation-chart', 'property': 'figure'},
+            {'id': 'simulation-results-display', 'property': 'children'},
+        ],
+        'inputs': [{'id': 'slider-renewables-share', 'property': 'value', 'value': value}],
+        'changedPropIds': ['slider-renewables-share.value'],
+        'state': [],
+    }
+
+
+def build_cases(app_module, points):
+    """Nama kasus -> daftar body request (dipakai bergiliran)"""
+    cases = {f"render_tab_content[{tab}]": [tab_request(tab)] for tab in app_module.TAB_BUILDERS}
+    slider = app_module.state.current.slider
+    values = np.linspace(slider['min'], slider['max'], points).round(3).tolist()
+    cases['update_simulation'] = [simulation_request(value) for value in values]
+    return cases
+
+
+def run_case(client, bodies, requests, warmup, cold=False, reset=None, accept_encoding=''):
+    def post(body):
+        if cold:
+            reset()
+        response = client.post('/_dash-update-component', json=body,
+                               headers={'Accept-Encoding': accept_encoding})
+        if response.status_code != 200:
+            raise RuntimeError(f"HTTP {response.status_code}: {response.data[:200]!r}")
+        return response
+
+    for i in range(warmup):
+        post(bodies[i % len(bodies)])
+
+    latencies, sizes = [], []
+    start = time.perf_counter()
+    for i in range(requests):
+        t0 = time.perf_counter()
+        response = post(bodies[i % len(bodies)])
+        latencies.append(time.perf_counter() - t0)
+        sizes.append(len(response.data))
+    elapsed = time.perf_counter() - start
+
+    # Memori diukur di putaran terpisah karena tracemalloc memperlambat request
+    tracemalloc.start()
+    for body in bodies:
+        post(body)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        'requests': requests,
+        'p50_ms': round(float(np.percentile(latencies_ms, 50)), 4),
+        'p95_ms': round(float(np.percentile(latencies_ms, 95)), 4),
+        'p99_ms': round(float(np.percentile(latencies_ms, 99)), 4),
+        'throughput_rps': round(requests / elapsed, 2),
+        'bytes': int(np.mean(sizes)),
+        'peak_memory_kb': round(peak / 1024, 1),
+    }
+
+
+def compare(results, baseline, threshold):
+    """Daftar regresi: metrik yang lebih buruk dari baseline melebihi threshold"""
+    regressions = []
+    for case, metrics in results['cases'].items():
+        base = baseline.get('cases', {}).get(case)
+        if base is None:
+            continue
+        for metric in HIGHER_IS_WORSE + LOWER_IS_WORSE:
+            if metric not in base or not base[metric]:
+                continue
+            change = metrics[metric] / base[metric] - 1
+            worse = change > threshold if metric in HIGHER_IS_WORSE else -change > threshold
+            if worse:
+                regressions.append((case, metric, base[metric], metrics[metric], change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=200, help="request per kasus")
+    parser.add_argument('--warmup', type=int, default=20)
+    parser.add_argument('--points', type=int, default=50, help="jumlah nilai slider yang diuji")
+    parser.add_argument('--cold', action='store_true', help="kosongkan cache figure sebelum setiap request")
+    parser.add_argument('--accept-encoding', default='',
+                        help="header Accept-Encoding (misalnya 'gzip' atau 'br') agar ukuran = ukuran terkompresi")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--threshold', type=float, default=float(os.environ.get('BENCHMARK_THRESHOLD', 0.2)),
+                        help="regresi relatif yang masih diterima (0.2 = 20%%)")
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--allow-missing-baseline', action='store_true',
+                        help="jangan gagal bila file baseline belum ada")
+    args = parser.parse_args()
+
+    # Tanpa baseline gerbang regresi tidak berarti; gagal lebih awal kecuali diizinkan
+    if not args.save_baseline and not os.path.exists(args.baseline) and not args.allow_missing_baseline:
+        print(f"Baseline {args.baseline} tidak ada; jalankan dengan --save-baseline "
+              f"atau --allow-missing-baseline", file=sys.stderr)
+        return 1
+
+    import app
+    client = app.server.test_client()
+    cases = build_cases(app, args.points)
+
+    results = {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'cold': args.cold,
+        'accept_encoding': args.accept_encoding,
+        'cases': {},
+    }
+    for name, bodies in cases.items():
+        metrics = run_case(client, bodies, args.requests, args.warmup, args.cold,
+                           app.figure_cache.invalidate, args.accept_encoding)
+        results['cases'][name] = metrics
+        print(f"{name:42s} p50={metrics['p50_ms']:.2f}ms p95={metrics['p95_ms']:.2f}ms "
+              f"p99={metrics['p99_ms']:.2f}ms {metrics['throughput_rps']:.0f} req/s "
+              f"{metrics['bytes']} B peak={metrics['peak_memory_kb']:.0f} kB")
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Hasil ditulis ke {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline disimpan ke {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"Baseline {args.baseline} belum ada; perbandingan dilewati (--allow-missing-baseline)")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold)
+    for case, metric, before, after, change in regressions:
+        print(f"REGRESI {case} {metric}: {before} -> {after} ({change:+.0%})")
+    if regressions:
+        return 1
+    print(f"Tidak ada regresi di atas {args.threshold:.0%} dibanding baseline")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
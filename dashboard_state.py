@@ -0,0 +1,440 @@
+# dashboard_state.py
+import json
+import os
+
+import numpy as np
+
+from attribution import compute_attribution, feature_importance
+from data_store import ColumnarStore
+from forecast import FORECAST_MODELS, ForecastEngine, policy_path
+from hot_reload import DerivedGraph, FileWatcher, ReloadableState
+from lazy import LazyModule
+from model_store import (
+    MODEL_FILES, PREDICTIONS_FILE, RAW_FEATURES, YOY_HORIZON, ResponseSurface,
+    add_engineered_features, file_hash, find_models_dir, has_raw_features,
+    load_models, model_path, predictions_path, prune_model_artifacts, training_rows,
+)
+from scenario_api import ScenarioEvaluator
+from uncertainty import compute_uncertainty
+
+pd = LazyModule('pandas')
+
+# --- 1. Sumber Data dan Model ---
+# Sumber data bisa diganti ke dataset OWID lengkap (semua negara) lewat DATA_FILE
+DATA_FILE = os.environ.get('DATA_FILE', 'data/indo_energy_filled.csv')
+DASHBOARD_COUNTRY = os.environ.get('DASHBOARD_COUNTRY', 'Indonesia')
+
+# Hanya kolom ini yang dibaca dari store; kolom lain di dataset tidak pernah disentuh
+DASHBOARD_COLUMNS = [
+    'year', 'renewables_share_elec', 'renewables_electricity', 'fossil_electricity',
+    'solar_electricity', 'wind_electricity', 'renewables_share_energy',
+    'renewables_yoy_growth', 'fossil_yoy_growth', 'share_hydro_in_renew',
+] + [c for c in RAW_FEATURES if c not in ('renewables_share_elec', 'renewables_electricity',
+                                          'fossil_electricity', 'solar_electricity',
+                                          'wind_electricity', 'renewables_share_energy')]
+
+# Kolom turunan yang tidak ada di dataset OWID, beserta kolom dasar untuk menghitungnya
+DERIVED_COLUMNS = {
+    'renewables_yoy_growth': ('renewables_electricity',),
+    'fossil_yoy_growth': ('fossil_electricity',),
+    'share_hydro_in_renew': ('hydro_electricity', 'renewables_electricity'),
+}
+# Riwayat OWID dimulai jauh sebelum data listrik tersedia
+FIRST_YEAR = 1985
+
+target_pemerintah_2025 = 23.0
+FORECAST_YEARS = [2024, 2025]
+# Tahun terakhir proyeksi rekursif di grafik tren
+FORECAST_HORIZON = int(os.environ.get('FORECAST_HORIZON', 2030))
+# Jalur kebijakan di grafik tren: tambahan pertumbuhan EBT (poin persen/tahun) dan tahun mulainya
+POLICY_SCENARIOS = {
+    'Akselerasi EBT +5 pp/tahun (mulai 2026)': (5.0, 2026),
+    'Akselerasi EBT +10 pp/tahun (mulai 2026)': (10.0, 2026),
+}
+# Model yang dijelaskan di tab faktor pendorong (SHAP dan partial dependence)
+ATTRIBUTION_TARGETS = ('renewables_yoy_growth', 'fossil_yoy_growth')
+
+# Hasil notebook, dipakai bila models/predictions.json (train.py) belum ada
+DEFAULT_TRAINING = {
+    'predictions': {
+        'prediksi_pangsa_ebt_2024': 17.68,
+        'prediksi_pangsa_ebt_2025': 18.68,
+        'pred_yoy_ebt_2024': 10.63,
+        'pred_yoy_ebt_2025': 11.29,
+    },
+    'metrics': {},
+    'linear_coefficients': [
+        {'Feature': 'share_hydro_in_renew', 'Lasso Coef': 0.650, 'Ridge Coef': 1.598},
+        {'Feature': 'fossil_yoy_growth', 'Lasso Coef': -0.774, 'Ridge Coef': -0.993},
+        {'Feature': 'carbon_intensity_elec', 'Lasso Coef': -0.643, 'Ridge Coef': -1.198},
+    ],
+}
+
+
+# Untuk production, kita akan menggunakan data dummy yang sudah didefinisikan
+# karena file CSV dan model mungkin tidak tersedia di deployment
+def create_dummy_data():
+    """Membuat data dummy untuk testing dan production"""
+    np.random.seed(42)  # Untuk konsistensi data
+    return pd.DataFrame({
+        'year': range(1985, 2024),
+        'renewables_share_elec': np.random.uniform(5, 20, 39),
+        'renewables_electricity': np.random.uniform(10, 100, 39),
+        'fossil_electricity': np.random.uniform(100, 300, 39),
+        'solar_electricity': np.random.uniform(0, 10, 39),
+        'wind_electricity': np.random.uniform(0, 5, 39),
+        'renewables_share_energy': np.random.uniform(8, 25, 39),
+        'renewables_yoy_growth': np.random.uniform(-5, 15, 39),
+        'fossil_yoy_growth': np.random.uniform(-2, 8, 39),
+        'carbon_intensity_elec': np.random.uniform(500, 800, 39),
+        'fossil_share_elec': np.random.uniform(70, 95, 39),
+        'share_hydro_in_renew': np.random.uniform(60, 90, 39)
+    })
+
+
+def find_data_file():
+    for path in (DATA_FILE, os.path.join('..', DATA_FILE)):
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def _yoy_growth(values):
+    """Pertumbuhan YoY (%); baris pertama 0 seperti pada dataset yang sudah diisi"""
+    growth = values.pct_change(fill_method=None).replace([np.inf, -np.inf], np.nan) * 100
+    growth.iloc[:1] = growth.iloc[:1].fillna(0.0)
+    return growth
+
+
+def add_derived_columns(df):
+    """Melengkapi kolom DERIVED_COLUMNS yang tidak ada di dataset (misalnya OWID)"""
+    df = df.copy()
+    if 'renewables_yoy_growth' not in df.columns:
+        df['renewables_yoy_growth'] = _yoy_growth(df['renewables_electricity'])
+    if 'fossil_yoy_growth' not in df.columns:
+        df['fossil_yoy_growth'] = _yoy_growth(df['fossil_electricity'])
+    if 'share_hydro_in_renew' not in df.columns:
+        share = df['hydro_electricity'] / df['renewables_electricity'] * 100
+        df['share_hydro_in_renew'] = share.replace([np.inf, -np.inf], np.nan)
+    return df
+
+
+def load_data():
+    """Sumber 'df': data satu negara beserta versinya (hash file CSV)"""
+    # Dummy data hanya dipakai bila file data tidak ada; file yang ada tapi
+    # tidak cocok (negara atau kolom salah) adalah error konfigurasi
+    data_path = find_data_file()
+    if data_path is None:
+        print("Using dummy data for production deployment")
+        return create_dummy_data(), 'dummy'
+    # CSV dikonversi sekali ke format kolom (.npy) lalu dibaca via memory-map
+    data_store = ColumnarStore.from_csv(data_path, default_country=DASHBOARD_COUNTRY)
+    try:
+        view = data_store.country(DASHBOARD_COUNTRY).years(first=FIRST_YEAR)
+    except KeyError:
+        raise ValueError(
+            f"{data_path}: negara '{DASHBOARD_COUNTRY}' tidak ada di dataset (periksa DASHBOARD_COUNTRY)"
+        ) from None
+
+    available = set(data_store.columns)
+    derived = [c for c in DERIVED_COLUMNS if c not in available]
+    base = [c for c in DASHBOARD_COLUMNS if c not in derived]
+    for column in derived:
+        base += [c for c in DERIVED_COLUMNS[column] if c not in base]
+    missing = [c for c in base if c not in available]
+    if missing:
+        raise ValueError(f"{data_path}: kolom {', '.join(missing)} tidak ada di dataset")
+    df = view.frame(base)
+    # Tahun tanpa data sama sekali (riwayat OWID sebelum data listrik tersedia)
+    df = df.dropna(how='all', subset=[c for c in df.columns if c != 'year']).reset_index(drop=True)
+    return add_derived_columns(df)[DASHBOARD_COLUMNS], file_hash(data_path)
+
+
+def model_files_version():
+    """Versi sumber 'models' dari hash file model, tanpa memuat modelnya"""
+    paths = {target: model_path(target) for target in sorted(MODEL_FILES)}
+    version = ';'.join(f"{target}={file_hash(path)}" for target, path in paths.items() if path)
+    return version or 'none'
+
+
+def load_model_source():
+    """Sumber 'models': model RF beserta versinya (hash setiap file model)"""
+    load_models.cache_clear()
+    models = load_models()
+    # Artefak cache (ForestArrays, SHAP, ketidakpastian) milik model lama dibuang
+    prune_model_artifacts()
+    return models, model_files_version()
+
+
+def load_training():
+    """Sumber 'training': prediksi, metrik, dan koefisien dari train.py beserta versinya"""
+    path = predictions_path()
+    try:
+        with open(path) as f:
+            return json.load(f), file_hash(path)
+    except (OSError, ValueError):
+        return DEFAULT_TRAINING, 'default'
+
+
+def source_versions():
+    """Versi setiap sumber saat ini (dipakai untuk memvalidasi bundle startup)"""
+    data_path = find_data_file()
+    path = predictions_path()
+    return {
+        'df': file_hash(data_path) if data_path else 'dummy',
+        'models': model_files_version(),
+        'training': file_hash(path) if os.path.exists(path) else 'default',
+    }
+
+
+def watched_files():
+    files = [find_data_file() or DATA_FILE]
+    models_dir = find_models_dir() or 'models'
+    files += [os.path.join(models_dir, filename) for filename in MODEL_FILES.values()]
+    files.append(predictions_path(models_dir))
+    return files
+
+
+def sources_for(paths):
+    """Memetakan file yang berubah ke nama sumber yang perlu dimuat ulang"""
+    model_files = set(MODEL_FILES.values())
+    names = set()
+    for path in paths:
+        filename = os.path.basename(path)
+        if filename in model_files:
+            names.add('models')
+        elif filename == PREDICTIONS_FILE:
+            names.add('training')
+        else:
+            names.add('df')
+    return sorted(names)
+
+
+# --- 2. Nilai Turunan ---
+# Setiap fungsi di bawah adalah satu node: dihitung ulang hanya bila inputnya berubah
+graph = DerivedGraph()
+
+
+@graph.node('training')
+def predictions(training):
+    """Nilai prediksi yang sudah dihitung oleh train.py"""
+    return {**DEFAULT_TRAINING['predictions'], **training['predictions']}
+
+
+@graph.node('training')
+def methodology(training):
+    """Koefisien Lasso/Ridge dan metrik validasi silang model RF"""
+    return {
+        'linear_coefficients': training.get('linear_coefficients') or DEFAULT_TRAINING['linear_coefficients'],
+        'metrics': training.get('metrics', {}),
+    }
+
+
+@graph.node('df', 'models')
+def forecast(df, models):
+    """Proyeksi rekursif sampai FORECAST_HORIZON: jalur dasar dan skenario kebijakan"""
+    if not has_raw_features(df) or not set(FORECAST_MODELS).issubset(models):
+        return None
+    engine = ForecastEngine(models, df.iloc[-1])
+    years = list(range(engine.start_year + 1, FORECAST_HORIZON + 1))
+    if not years:
+        return None
+    paths = [policy_path(years)] + [policy_path(years, pp, start) for pp, start in POLICY_SCENARIOS.values()]
+    result = engine.run(paths)
+    return {
+        'years': years,
+        'share': result['renewables_share_elec'][0],
+        'renewables_yoy_growth': result['renewables_yoy_growth'][0],
+        'fossil_yoy_growth': result['fossil_yoy_growth'][0],
+        'scenarios': dict(zip(POLICY_SCENARIOS, result['renewables_share_elec'][1:])),
+        # Fitur input model YoY untuk setiap tahun jalur dasar (tab keandalan)
+        'inputs': engine.inputs(paths[0]),
+    }
+
+
+@graph.node('df', 'predictions', 'forecast')
+def kpis(df, predictions, forecast):
+    tahun_terakhir = int(df['year'].max())
+    pangsa_ebt_saat_ini = df.loc[df['year'] == tahun_terakhir, 'renewables_share_elec'].iloc[0]
+    prediksi_pangsa_ebt_2025 = predictions['prediksi_pangsa_ebt_2025']
+    if forecast is not None and 2025 in forecast['years']:
+        prediksi_pangsa_ebt_2025 = float(forecast['share'][forecast['years'].index(2025)])
+    gap_menuju_target_2025 = target_pemerintah_2025 - prediksi_pangsa_ebt_2025
+    return {
+        'tahun_terakhir': tahun_terakhir,
+        'pangsa_ebt_saat_ini': pangsa_ebt_saat_ini,
+        'prediksi_pangsa_ebt_2025': prediksi_pangsa_ebt_2025,
+        'gap_menuju_target_2025': gap_menuju_target_2025,
+        'status_target': "Tercapai ✅" if gap_menuju_target_2025 <= 0 else "Belum Tercapai ❌",
+    }
+
+
+@graph.node('df')
+def df_line_chart(df):
+    # Filter data untuk Line Chart (1985 sampai tahun data terakhir)
+    return df[df['year'] >= 1985].copy()
+
+
+@graph.node('predictions', 'forecast')
+def simulation_baseline(predictions, forecast):
+    """Prediksi YoY EBT 2024-2025 yang menjadi baseline tab simulasi (sama dengan proyeksi di overview)"""
+    baseline = {year: predictions[f'pred_yoy_ebt_{year}'] for year in FORECAST_YEARS}
+    if forecast is not None:
+        for year, value in zip(forecast['years'], forecast['renewables_yoy_growth']):
+            if year in baseline:
+                baseline[year] = float(value)
+    return baseline
+
+
+@graph.node('df_line_chart', 'predictions', 'forecast')
+def series(df_line_chart, predictions, forecast):
+    """Gabungan data historis dan prediksi untuk tahun setelah data terakhir"""
+    scenarios = {}
+    if forecast is not None:
+        years = forecast['years']
+        future_share_df = pd.DataFrame({'year': years, 'renewables_share_elec': forecast['share']})
+        future_yoy_df = pd.DataFrame({'year': years, 'renewables_yoy_growth': forecast['renewables_yoy_growth']})
+        scenarios = {
+            label: pd.DataFrame({'year': years, 'renewables_share_elec': values})
+            for label, values in forecast['scenarios'].items()
+        }
+    else:
+        # Tanpa model/fitur mentah: nilai prediksi 2024-2025 yang sudah dihitung
+        last_year = df_line_chart['year'].max()
+        years = [year for year in FORECAST_YEARS if year > last_year]
+        share = {2024: predictions['prediksi_pangsa_ebt_2024'], 2025: predictions['prediksi_pangsa_ebt_2025']}
+        yoy = {2024: predictions['pred_yoy_ebt_2024'], 2025: predictions['pred_yoy_ebt_2025']}
+        future_share_df = pd.DataFrame({'year': years, 'renewables_share_elec': [share[y] for y in years]})
+        future_yoy_df = pd.DataFrame({'year': years, 'renewables_yoy_growth': [yoy[y] for y in years]})
+    return {
+        'scenarios': scenarios,
+        'future_share_df': future_share_df,
+        'combined_share_df': pd.concat([df_line_chart[['year', 'renewables_share_elec']], future_share_df]),
+        'future_yoy_df': future_yoy_df,
+        'combined_yoy_df': pd.concat([df_line_chart[['year', 'renewables_yoy_growth']], future_yoy_df]),
+    }
+
+
+@graph.node('df')
+def slider(df):
+    # Rentang slider simulasi (dipakai layout dan tabel prediksi)
+    return {
+        'min': df['renewables_share_energy'].min(),
+        'max': df['renewables_share_energy'].max() + 5,
+        'step': 0.1,
+        'value': df['renewables_share_energy'].iloc[-1],
+        'marks': {i: str(i) for i in range(int(df['renewables_share_energy'].min()), int(df['renewables_share_energy'].max() + 6), 2)},
+    }
+
+
+@graph.node('df', 'models', 'slider')
+def simulation_surface(df, models, slider):
+    # Prediksi model RF untuk seluruh rentang slider sekaligus
+    if 'renewables_yoy_growth' not in models or not has_raw_features(df):
+        return None
+    return ResponseSurface(
+        models['renewables_yoy_growth'],
+        base_row=df.iloc[-1],
+        feature='renewables_share_energy',
+        start=slider['min'],
+        stop=slider['max'],
+        step=slider['step'],
+    )
+
+
+@graph.node('simulation_surface', 'slider', 'simulation_baseline')
+def simulation_table(simulation_surface, slider, simulation_baseline):
+    """Data yang dibutuhkan browser untuk menghitung simulasi tanpa request ke server"""
+    return {
+        'start': simulation_surface.start if simulation_surface is not None else None,
+        'step': simulation_surface.step if simulation_surface is not None else slider['step'],
+        'deltas': (simulation_surface.values - simulation_surface.reference).round(6).tolist()
+                  if simulation_surface is not None else None,
+        'current_share': float(slider['value']),
+        'fallback_slope': 0.6,
+        'base_2024': simulation_baseline[2024],
+        'base_2025': simulation_baseline[2025],
+    }
+
+
+@graph.node('df', 'models', 'forecast')
+def reliability(df, models, forecast):
+    """Ketidakpastian prediksi YoY 2024-2025 dari sebaran prediksi antar pohon RF"""
+    years = [year for year in FORECAST_YEARS if forecast is not None and year in forecast['years']]
+    if 'renewables_yoy_growth' in models and years:
+        yoy_model = models['renewables_yoy_growth']
+        yoy_features = list(yoy_model.feature_names_in_)
+        # Baris training disusun ulang persis seperti di train.py
+        X_train, y_train = training_rows(
+            add_engineered_features(df), yoy_features, 'renewables_yoy_growth', YOY_HORIZON,
+        )
+        # Input yang sama dengan proyeksi rekursif, jadi rata-ratanya sama dengan tab lain
+        rows = [forecast['years'].index(year) for year in years]
+        result = compute_uncertainty(
+            yoy_model,
+            model_path('renewables_yoy_growth'),
+            X_future=forecast['inputs'].iloc[rows][yoy_features],
+            X_train=X_train,
+            y_train=y_train,
+        )
+        return {
+            'years': years,
+            'mean': list(result['mean']),
+            'std': list(result['std']),
+            'band_lower': result['quantiles'][0],
+            'band_upper': result['quantiles'][-1],
+            'band_label': 'Interval Prediksi 90% (Kuantil 5–95 antar Pohon)',
+            'residuals': result['oob_residuals'],
+            'residual_title': "Distribusi Residual Model (Out-of-Bag)",
+        }
+
+    mean, std = [10.50, 11.23], [0.75, 0.82]
+    return {
+        'years': FORECAST_YEARS,
+        'mean': mean,
+        'std': std,
+        'band_lower': [m - s for m, s in zip(mean, std)],
+        'band_upper': [m + s for m, s in zip(mean, std)],
+        'band_label': 'Confidence Band (±1 STD)',
+        'residuals': np.random.default_rng(42).normal(0, 1, 100),
+        'residual_title': "Distribusi Residual Model",
+    }
+
+
+@graph.node('df', 'models')
+def attribution(df, models):
+    """SHAP dan partial dependence model YoY atas seluruh data historis"""
+    if not has_raw_features(df):
+        return {}
+    frame = add_engineered_features(df)
+    results = {}
+    for target in ATTRIBUTION_TARGETS:
+        if target not in models:
+            continue
+        model = models[target]
+        features = list(model.feature_names_in_)
+        X = frame[features].to_numpy(dtype=float)
+        result = compute_attribution(model, model_path(target), X)
+        results[target] = {
+            'features': features,
+            'importance': feature_importance(features, X, result['shap_values']),
+            **result,
+        }
+    return results
+
+
+@graph.node('df', 'models')
+def scenario_evaluator(df, models):
+    if not models or not has_raw_features(df):
+        return None
+    return ScenarioEvaluator(models, base_row=df.iloc[-1])
+
+
+def create_state(initial=None):
+    loaders = {'df': load_data, 'models': load_model_source, 'training': load_training}
+    return ReloadableState(graph, loaders, initial)
+
+
+def create_watcher(state, interval=5.0):
+    """Pantau data/ dan models/; perubahan memicu perhitungan ulang yang terdampak saja"""
+    return FileWatcher(watched_files, lambda changed: state.reload(sources_for(changed)), interval)
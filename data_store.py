@@ -0,0 +1,147 @@
+# data_store.py
+import json
+import os
+import shutil
+
+import numpy as np
+
+from lazy import LazyModule
+from model_store import artifact_cache_dir, file_hash, prune_artifacts
+
+pd = LazyModule('pandas')
+
+
+class CountryView:
+    """Potongan satu negara dari ColumnarStore.
+
+    Setiap kolom hanya dibaca saat diminta, dan hasilnya berupa slice dari
+    array memory-mapped (tanpa scan dan tanpa copy).
+    """
+
+    def __init__(self, store, start, stop):
+        self.store = store
+        self.start = start
+        self.stop = stop
+
+    def __len__(self):
+        return self.stop - self.start
+
+    def __getitem__(self, column):
+        return self.store.column(column)[self.start:self.stop]
+
+    @property
+    def columns(self):
+        return self.store.columns
+
+    def years(self, first=None, last=None):
+        """Mempersempit view ke rentang tahun (inklusif); baris sudah terurut per tahun"""
+        year = self['year']
+        start = self.start + (np.searchsorted(year, first, side='left') if first is not None else 0)
+        stop = self.start + (np.searchsorted(year, last, side='right') if last is not None else len(year))
+        return CountryView(self.store, int(start), int(stop))
+
+    def frame(self, columns=None):
+        columns = list(columns or self.columns)
+        missing = [c for c in columns if c not in self.store.columns]
+        if missing:
+            raise KeyError(f"Kolom tidak ada di dataset: {', '.join(missing)}")
+        data = {}
+        for column in columns:
+            values = self[column]
+            categories = self.store.categories.get(column)
+            if categories is not None:
+                values = pd.Categorical.from_codes(values, categories=categories)
+            data[column] = values
+        return pd.DataFrame(data, copy=False)
+
+
+class ColumnarStore:
+    """Dataset energi dalam format kolom: satu file .npy per kolom.
+
+    CSV dikonversi sekali, diurutkan per negara lalu tahun, sehingga satu negara
+    selalu berupa rentang baris yang berurutan. Indeks negara -> (awal, akhir)
+    disimpan di manifest.json.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        with open(os.path.join(root, 'manifest.json')) as f:
+            manifest = json.load(f)
+        self.columns = manifest['columns']
+        self.categories = manifest['categories']
+        self.index = {country: tuple(bounds) for country, bounds in manifest['index'].items()}
+        self._arrays = {}
+
+    @classmethod
+    def from_csv(cls, csv_path, country_column='country', default_country='Indonesia'):
+        """Membuka store untuk `csv_path`, mengonversi CSV bila belum pernah dilakukan.
+
+        CSV tanpa kolom negara (misalnya data satu negara) dianggap milik
+        `default_country`. Hasil konversi dibedakan per hash isi file.
+        """
+        key = file_hash(csv_path)[:16]
+        root = os.path.join(artifact_cache_dir(), 'columnar', key)
+        if not os.path.exists(os.path.join(root, 'manifest.json')):
+            cls._convert(csv_path, root, country_column, default_country)
+        # Versi CSV sebelumnya tidak akan dibaca lagi (satu dataset per folder cache)
+        prune_artifacts(os.path.join('columnar', '*'), lambda name: name == key)
+        return cls(root)
+
+    @staticmethod
+    def _convert(csv_path, root, country_column, default_country):
+        frame = pd.read_csv(csv_path, low_memory=False)
+        if country_column not in frame.columns:
+            frame.insert(0, country_column, default_country)
+        frame = frame.sort_values([country_column, 'year'], kind='stable').reset_index(drop=True)
+
+        # Tulis ke folder sementara lalu rename, agar proses lain tidak membaca store setengah jadi
+        tmp_root = f"{root}.tmp-{os.getpid()}"
+        os.makedirs(tmp_root, exist_ok=True)
+        categories = {}
+        for column in frame.columns:
+            values = frame[column]
+            if values.dtype == object:
+                codes, uniques = pd.factorize(values, sort=True)
+                categories[column] = [str(u) for u in uniques]
+                array = codes.astype(np.int32)
+            else:
+                array = values.to_numpy()
+            np.save(os.path.join(tmp_root, f"{column}.npy"), array)
+
+        countries = frame[country_column].to_numpy()
+        boundaries = np.flatnonzero(countries[1:] != countries[:-1]) + 1
+        starts = np.concatenate([[0], boundaries])
+        stops = np.concatenate([boundaries, [len(frame)]])
+        manifest = {
+            'source': os.path.abspath(csv_path),
+            'n_rows': len(frame),
+            'columns': list(frame.columns),
+            'categories': categories,
+            'index': {str(countries[a]): [int(a), int(b)] for a, b in zip(starts, stops)},
+        }
+        with open(os.path.join(tmp_root, 'manifest.json'), 'w') as f:
+            json.dump(manifest, f)
+
+        try:
+            os.replace(tmp_root, root)
+        except OSError:
+            # Proses lain sudah selesai lebih dulu
+            shutil.rmtree(tmp_root, ignore_errors=True)
+
+    def column(self, name):
+        array = self._arrays.get(name)
+        if array is None:
+            if name not in self.columns:
+                raise KeyError(name)
+            array = np.load(os.path.join(self.root, f"{name}.npy"), mmap_mode='r')
+            self._arrays[name] = array
+        return array
+
+    def countries(self):
+        return list(self.index)
+
+    def country(self, name):
+        if name not in self.index:
+            raise KeyError(f"Negara tidak ada di dataset: {name}")
+        start, stop = self.index[name]
+        return CountryView(self, start, stop)
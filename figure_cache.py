@@ -0,0 +1,127 @@
+# figure_cache.py
+import json
+import threading
+
+from flask import g, request
+from plotly.io.json import to_json_plotly
+
+from instrumentation import timed
+from payload import compressed_sizes, encode_payload
+
+# Nilai pengganti yang dikembalikan callback; setelah Dash menyusun respons,
+# penanda ini diganti dengan JSON tab yang tersimpan
+PLACEHOLDER = "__figure_cache_json__"
+_PLACEHOLDER_JSON = json.dumps(PLACEHOLDER).encode()
+
+
+class FigureCache:
+    """Cache komponen tab yang sudah diserialisasi ke JSON.
+
+    Setiap tab dibangun sekali per versi data. Selama versi tidak berubah,
+    callback mengembalikan `PLACEHOLDER` dan JSON yang tersimpan disisipkan
+    langsung ke body respons (lihat `install`), tanpa serialisasi ulang.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _count(self, hit):
+        with self._stats_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, key, version, builder):
+        """JSON konten tab untuk `version`; dibangun dengan `builder()` bila belum ada"""
+        entry = self._entries.get(key)
+        if entry is not None and entry["version"] == version:
+            self._count(hit=True)
+            return entry["json"]
+
+        with self._lock:
+            # Cek ulang: request lain mungkin sudah membangun tab ini
+            entry = self._entries.get(key)
+            if entry is not None and entry["version"] == version:
+                self._count(hit=True)
+                return entry["json"]
+            self._count(hit=False)
+            with timed("figure"):
+                component = builder()
+            with timed("serialize"):
+                serialized = to_json_plotly(component)
+                # Data trace dikirim sebagai typed array yang dipadatkan
+                payload = encode_payload(json.loads(serialized))
+            entry = {
+                "version": version,
+                "json": json.dumps(payload, separators=(",", ":")),
+                "raw_bytes": len(serialized),
+            }
+            self._entries[key] = entry
+        return entry["json"]
+
+    def respond(self, key, version, builder):
+        """Untuk callback Dash: JSON tab dicatat di request, callback mengembalikan penanda"""
+        g.figure_cache_json = self.get(key, version, builder)
+        return PLACEHOLDER
+
+    def export(self):
+        """Entri yang sudah diserialisasi, untuk disimpan di bundle startup"""
+        return {
+            key: {"version": entry["version"], "json": entry["json"], "raw_bytes": entry["raw_bytes"]}
+            for key, entry in list(self._entries.items())
+        }
+
+    def load(self, entries):
+        """Isi cache dari hasil `export` tanpa membangun ulang figure"""
+        with self._lock:
+            self._entries.update(entries)
+
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self):
+        with self._stats_lock:
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / total, 4) if total else 0.0,
+            "entries": {
+                key: {
+                    "version": entry["version"],
+                    # Ukuran sebelum/sesudah pemadatan typed array dan kompresi
+                    "bytes_raw": entry["raw_bytes"],
+                    "bytes": len(entry["json"]),
+                    **{f"bytes_{encoding}": size
+                       for encoding, size in compressed_sizes(entry["json"].encode()).items()},
+                }
+                for key, entry in list(self._entries.items())
+            },
+        }
+
+
+def install(server):
+    """Sisipkan JSON tab dari FigureCache.respond ke respons callback.
+
+    Harus dipasang setelah kompresi (payload.install): after_request Flask
+    dijalankan terbalik, jadi penyisipan terjadi sebelum body dikompresi.
+    """
+    @server.after_request
+    def splice_cached_json(response):
+        cached = g.pop('figure_cache_json', None)
+        if cached is None or not request.path.endswith('_dash-update-component'):
+            return response
+        body = response.get_data()
+        if _PLACEHOLDER_JSON in body:
+            response.set_data(body.replace(_PLACEHOLDER_JSON, cached.encode(), 1))
+        return response
@@ -0,0 +1,145 @@
+# forecast.py
+"""Proyeksi multi-tahun rekursif dengan pohon skenario yang di-memo.
+
+Setiap langkah tahun, model YoY EBT dan fosil memprediksi pertumbuhan tahun
+berikutnya dari fitur tahun ini. Volume pembangkitan diperbarui dengan
+pertumbuhan itu (ditambah penyesuaian kebijakan skenario), lalu pangsa EBT dan
+fitur lain dihitung ulang dari volume baru sebagai input langkah berikutnya.
+Model YoY dilatih dengan arti yang sama (model_store.YOY_HORIZON).
+
+Skenario adalah jalur kebijakan: satu aksi per tahun. Jalur yang berbagi awalan
+hanya dihitung sekali, dan semua awalan baru pada satu langkah diprediksi
+dengan satu panggilan `predict` per model.
+"""
+import numpy as np
+
+from model_store import RAW_FEATURES, scenario_features
+
+FORECAST_MODELS = ('renewables_yoy_growth', 'fossil_yoy_growth')
+# Subtipe EBT yang tumbuh mengikuti total EBT (bauran antar subtipe tetap)
+RENEWABLE_PARTS = ('solar_electricity', 'wind_electricity', 'hydro_electricity', 'biofuel_electricity')
+
+_COLUMN = {name: i for i, name in enumerate(RAW_FEATURES)}
+
+
+def policy_path(years, renewables_pp=0.0, start_year=None, fossil_pp=0.0):
+    """Jalur kebijakan: tambahan pertumbuhan (poin persen) EBT dan fosil mulai `start_year`"""
+    return tuple(
+        (renewables_pp, fossil_pp) if start_year is not None and year >= start_year else (0.0, 0.0)
+        for year in years
+    )
+
+
+def advance(states, renewables_growth, fossil_growth):
+    """Keadaan tahun berikutnya (array n x RAW_FEATURES) dari pertumbuhan YoY (%)"""
+    col = _COLUMN
+    states = np.asarray(states, dtype=float)
+    nxt = states.copy()
+    renewables_ratio = np.maximum(1 + np.asarray(renewables_growth) / 100, 0.0)
+    fossil_ratio = np.maximum(1 + np.asarray(fossil_growth) / 100, 0.0)
+
+    generation = states[:, col['electricity_generation']]
+    renewables = states[:, col['renewables_electricity']]
+    fossil = states[:, col['fossil_electricity']]
+    # Sumber di luar EBT dan fosil (misalnya nuklir) dianggap tetap
+    other = np.maximum(generation - renewables - fossil, 0.0)
+
+    nxt[:, col['renewables_electricity']] = renewables * renewables_ratio
+    for name in RENEWABLE_PARTS:
+        nxt[:, col[name]] = states[:, col[name]] * renewables_ratio
+    nxt[:, col['fossil_electricity']] = fossil * fossil_ratio
+    new_generation = nxt[:, col['renewables_electricity']] + nxt[:, col['fossil_electricity']] + other
+    nxt[:, col['electricity_generation']] = new_generation
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        share = nxt[:, col['renewables_electricity']] / new_generation * 100
+        fossil_share = nxt[:, col['fossil_electricity']] / new_generation * 100
+        # Pangsa energi primer, intensitas karbon, dan konsumsi per kapita
+        # bergerak sebanding dengan pangsa listrik dan total pembangkitan
+        nxt[:, col['renewables_share_energy']] *= np.nan_to_num(share / states[:, col['renewables_share_elec']], nan=1.0)
+        nxt[:, col['carbon_intensity_elec']] *= np.nan_to_num(fossil_share / states[:, col['fossil_share_elec']], nan=1.0)
+        nxt[:, col['per_capita_electricity']] *= np.nan_to_num(new_generation / generation, nan=1.0)
+    nxt[:, col['renewables_share_elec']] = share
+    nxt[:, col['fossil_share_elec']] = fossil_share
+    return nxt
+
+
+class ForecastEngine:
+    """Proyeksi rekursif banyak jalur kebijakan sekaligus.
+
+    Keadaan setiap awalan jalur (tuple aksi) dan prediksi pertumbuhannya
+    disimpan di memo, sehingga pemanggilan `run` berikutnya dengan jalur yang
+    berbagi awalan hanya menghitung cabang yang baru.
+    """
+
+    def __init__(self, models, base_row):
+        self.renewables_model = models['renewables_yoy_growth']
+        self.fossil_model = models['fossil_yoy_growth']
+        self.base_row = base_row
+        self.start_year = int(base_row['year'])
+        self._states = {(): np.array([float(base_row[name]) for name in RAW_FEATURES])}
+        self._growth = {}
+        self.predict_calls = 0
+
+    def _features(self, prefixes):
+        states = np.vstack([self._states[prefix] for prefix in prefixes])
+        return scenario_features(self.base_row, {name: states[:, i] for i, name in enumerate(RAW_FEATURES)})
+
+    def _predict_growth(self, prefixes):
+        """Pertumbuhan YoY tahun berikutnya untuk setiap awalan: satu predict per model"""
+        frame = self._features(prefixes)
+        renewables = self.renewables_model.predict(frame[self.renewables_model.feature_names_in_])
+        fossil = self.fossil_model.predict(frame[self.fossil_model.feature_names_in_])
+        self.predict_calls += 2
+        for prefix, r, f in zip(prefixes, renewables, fossil):
+            self._growth[prefix] = (float(r), float(f))
+
+    def run(self, paths):
+        """Proyeksi setiap jalur; semua jalur harus sama panjang (satu aksi per tahun).
+
+        Mengembalikan dict berisi 'years' dan array (n_jalur, n_tahun) untuk
+        pangsa EBT, pertumbuhan YoY EBT/fosil, dan volume EBT/fosil.
+        """
+        paths = [tuple((float(r), float(f)) for r, f in path) for path in paths]
+        n_steps = len(paths[0]) if paths else 0
+        if any(len(path) != n_steps for path in paths):
+            raise ValueError("Semua jalur harus memiliki jumlah tahun yang sama")
+
+        for step in range(n_steps):
+            parents = sorted({path[:step] for path in paths} - set(self._growth))
+            if parents:
+                self._predict_growth(parents)
+            children = sorted({path[:step + 1] for path in paths} - set(self._states))
+            if children:
+                growth = np.array([self._growth[child[:-1]] for child in children])
+                actions = np.array([child[-1] for child in children])
+                states = advance(
+                    np.vstack([self._states[child[:-1]] for child in children]),
+                    growth[:, 0] + actions[:, 0],
+                    growth[:, 1] + actions[:, 1],
+                )
+                for child, state in zip(children, states):
+                    self._states[child] = state
+
+        result = {'years': [self.start_year + step + 1 for step in range(n_steps)]}
+        outputs = {
+            'renewables_share_elec': lambda prefix: self._states[prefix][_COLUMN['renewables_share_elec']],
+            'renewables_electricity': lambda prefix: self._states[prefix][_COLUMN['renewables_electricity']],
+            'fossil_electricity': lambda prefix: self._states[prefix][_COLUMN['fossil_electricity']],
+            'renewables_yoy_growth': lambda prefix: self._growth[prefix[:-1]][0] + prefix[-1][0],
+            'fossil_yoy_growth': lambda prefix: self._growth[prefix[:-1]][1] + prefix[-1][1],
+        }
+        for name, value in outputs.items():
+            result[name] = np.array([[value(path[:step + 1]) for step in range(n_steps)] for path in paths])
+        return result
+
+    def inputs(self, path):
+        """Fitur yang memprediksi pertumbuhan setiap tahun jalur (keadaan tahun sebelumnya).
+
+        Jalur harus sudah dihitung dengan `run`.
+        """
+        path = tuple((float(r), float(f)) for r, f in path)
+        return self._features([path[:step] for step in range(len(path))])
+
+    def memo_size(self):
+        return len(self._states) - 1
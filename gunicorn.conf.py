@@ -0,0 +1,30 @@
+# gunicorn.conf.py
+import os
+
+from preload import freeze_for_fork, log_memory
+
+# Data, model, dan figure dimuat sekali di master lalu dibagi ke worker
+# lewat copy-on-write. Set PRELOAD_APP=0 agar setiap worker memuat sendiri.
+preload_app = os.environ.get('PRELOAD_APP', '1') == '1'
+if preload_app:
+    # Thread hot reload tidak ikut ter-fork; dimulai di setiap worker (post_fork)
+    os.environ['DASHBOARD_PRELOADED'] = '1'
+
+
+def when_ready(server):
+    if preload_app:
+        freeze_for_fork()
+    log_memory(f"master {os.getpid()}", server.log)
+
+
+def post_fork(server, worker):
+    log_memory(f"worker {worker.pid} setelah fork", server.log)
+    if preload_app:
+        import app
+        app.start_background_tasks()
+
+
+def post_request(worker, req, environ, resp):
+    if not getattr(worker, 'memory_logged', False):
+        worker.memory_logged = True
+        log_memory(f"worker {worker.pid} setelah request pertama", worker.log)
@@ -0,0 +1,210 @@
+# hot_reload.py
+import hashlib
+import os
+import threading
+import time
+
+from instrumentation import timed
+from model_store import file_hash
+
+
+class Snapshot:
+    """Kumpulan nilai turunan yang tidak diubah lagi setelah dibuat.
+
+    Request cukup mengambil referensi snapshot saat ini sekali; snapshot baru
+    menggantikannya lewat satu assignment atribut (atomik), tanpa lock.
+    """
+
+    def __init__(self, values, versions, recomputed=(), complete=True):
+        self._values = values
+        self.versions = versions
+        self.recomputed = tuple(recomputed)
+        # False untuk snapshot dari bundle startup: hanya berisi versi, belum nilainya
+        self.complete = complete
+
+    def __getattr__(self, name):
+        try:
+            return self._values[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __getitem__(self, name):
+        return self._values[name]
+
+    def __contains__(self, name):
+        return name in self._values
+
+    def version_of(self, *names):
+        """Versi gabungan beberapa nilai, dipakai sebagai kunci cache figure"""
+        h = hashlib.sha1()
+        for name in names:
+            h.update(f"{name}={self.versions[name]};".encode())
+        return h.hexdigest()
+
+
+class DerivedGraph:
+    """Daftar nilai turunan beserta input yang dibutuhkan masing-masing.
+
+    Node didaftarkan berurutan (input harus terdaftar lebih dulu). Saat membangun
+    snapshot baru, node yang versi input-nya tidak berubah dipakai ulang dari
+    snapshot sebelumnya, sehingga hanya bagian yang terdampak yang dihitung ulang.
+    """
+
+    def __init__(self):
+        self.nodes = {}
+
+    def node(self, *deps):
+        def register(fn):
+            self.nodes[fn.__name__] = (deps, fn)
+            return fn
+        return register
+
+    def build(self, sources, previous=None):
+        """`sources` berisi nama -> (nilai, versi) untuk data mentah (file)"""
+        values = {name: value for name, (value, _) in sources.items()}
+        versions = {name: version for name, (_, version) in sources.items()}
+        recomputed = []
+        for name, (deps, fn) in self.nodes.items():
+            version = hashlib.sha1(
+                ";".join(f"{dep}={versions[dep]}" for dep in deps).encode()
+            ).hexdigest()
+            if previous is not None and name in previous and previous.versions.get(name) == version:
+                values[name] = previous[name]
+            else:
+                with timed(name):
+                    values[name] = fn(*(values[dep] for dep in deps))
+                recomputed.append(name)
+            versions[name] = version
+        return Snapshot(values, versions, recomputed)
+
+
+class ReloadableState:
+    """Memegang snapshot aktif dan sumber data (file) yang membentuknya.
+
+    `loaders` berisi nama sumber -> fungsi yang mengembalikan (nilai, versi).
+    `reload` hanya memuat ulang sumber yang berubah lalu menukar snapshot.
+
+    Bila `initial` diberikan (snapshot berisi versi saja, dari bundle startup),
+    sumber belum dimuat: `load_in_background` memuatnya di thread terpisah dan
+    `ready` menunggu sampai snapshot lengkap tersedia.
+    """
+
+    def __init__(self, graph, loaders, initial=None):
+        self.graph = graph
+        self.loaders = loaders
+        self.listeners = []
+        self._ready = threading.Event()
+        self._error = None
+        self._loader_pid = None
+        if initial is None:
+            self.sources = {name: self._load(name) for name in loaders}
+            self.current = graph.build(self.sources)
+            self._ready.set()
+        else:
+            self.sources = None
+            self.current = initial
+
+    def load_in_background(self):
+        """Mulai memuat snapshot lengkap; aman dipanggil ulang (misalnya setelah fork)"""
+        if self._ready.is_set() or self._loader_pid == os.getpid():
+            return
+        self._loader_pid = os.getpid()
+        threading.Thread(target=self._load_all, name="state-load", daemon=True).start()
+
+    def _load_all(self):
+        try:
+            with timed("background_load"):
+                sources = {name: self._load(name) for name in self.loaders}
+                snapshot = self.graph.build(sources, previous=self.current)
+            self.sources = sources
+            self.current = snapshot
+        except Exception as exc:
+            self._error = exc
+            print(f"Gagal memuat data/model: {exc}")
+            return
+        finally:
+            self._ready.set()
+        for listener in self.listeners:
+            listener(snapshot)
+
+    def ready(self):
+        """Snapshot lengkap; menunggu bila data dan model masih dimuat di latar belakang"""
+        if not self._ready.is_set():
+            self.load_in_background()
+            self._ready.wait()
+        if self._error is not None:
+            raise RuntimeError("Data/model gagal dimuat") from self._error
+        return self.current
+
+    def _load(self, name):
+        with timed(f"load_{name}"):
+            return self.loaders[name]()
+
+    def reload(self, names):
+        self.ready()
+        sources = dict(self.sources)
+        for name in names:
+            sources[name] = self._load(name)
+        snapshot = self.graph.build(sources, previous=self.current)
+        self.sources = sources
+        self.current = snapshot
+        print(f"Hot reload: {', '.join(names)} berubah, dihitung ulang: {', '.join(snapshot.recomputed) or '-'}")
+        for listener in self.listeners:
+            listener(snapshot)
+        return snapshot
+
+
+class FileWatcher:
+    """Memantau file lewat mtime/ukuran lalu memastikan perubahan dengan hash isi.
+
+    `paths` adalah fungsi yang mengembalikan daftar file yang dipantau (file
+    yang belum ada juga boleh, agar file baru terdeteksi). `on_change` dipanggil
+    dengan daftar file yang isinya benar-benar berubah.
+    """
+
+    def __init__(self, paths, on_change, interval=5.0):
+        self.paths = paths
+        self.on_change = on_change
+        self.interval = interval
+        self._stats = self._stat_all()
+        self._hashes = {path: file_hash(path) for path in self._stats}
+        self._pid = None
+
+    def _stat_all(self):
+        stats = {}
+        for path in self.paths():
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            stats[path] = (st.st_mtime_ns, st.st_size)
+        return stats
+
+    def poll(self):
+        stats = self._stat_all()
+        touched = [p for p in set(stats) | set(self._stats) if stats.get(p) != self._stats.get(p)]
+        self._stats = stats
+        changed = []
+        for path in touched:
+            digest = file_hash(path) if path in stats else None
+            if digest != self._hashes.get(path):
+                self._hashes[path] = digest
+                changed.append(path)
+        if changed:
+            self.on_change(changed)
+        return changed
+
+    def start(self):
+        """Mulai thread pemantau; aman dipanggil ulang (misalnya setelah fork)"""
+        if self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        threading.Thread(target=self._run, name="hot-reload", daemon=True).start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.poll()
+            except Exception as exc:  # watcher tidak boleh mati karena satu file rusak
+                print(f"Hot reload gagal: {exc}")
@@ -0,0 +1,163 @@
+# instrumentation.py
+"""Pengukuran waktu di jalur panas: callback Dash dan fase muat saat startup.
+
+Setiap callback mencatat waktu per tahap (`lookup`, `figure`, `serialize`).
+Hasilnya dikirim sebagai header `Server-Timing` dan diakumulasi menjadi
+histogram Prometheus di `/metrics`. Set INSTRUMENTATION=0 untuk mematikan
+semuanya (callback tidak dibungkus dan `/metrics` tidak didaftarkan).
+"""
+import bisect
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+from flask import Response, g, has_request_context
+
+ENABLED = os.environ.get('INSTRUMENTATION', '1') == '1'
+
+# Batas bucket histogram (detik)
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+
+class Metrics:
+    """Histogram per nama metrik dan kombinasi label, dirender ke format teks Prometheus.
+
+    Angka bersifat per proses: di gunicorn setiap worker punya histogramnya sendiri.
+    """
+
+    HELP = {
+        'dashboard_callback_duration_seconds': "Total waktu callback Dash, termasuk serialisasi respons.",
+        'dashboard_callback_stage_duration_seconds': "Waktu per tahap callback (lookup, figure, serialize, compress).",
+        'dashboard_load_duration_seconds': "Waktu fase muat data, model, dan nilai turunan (startup dan hot reload).",
+    }
+
+    def __init__(self):
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name, seconds, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    def render(self):
+        with self._lock:
+            items = sorted(
+                (key, list(h.counts), h.sum, h.count) for key, h in self._histograms.items()
+            )
+        lines, seen = [], set()
+        for (name, labels), counts, total, count in items:
+            if name not in seen:
+                seen.add(name)
+                lines.append(f"# HELP {name} {self.HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} histogram")
+            label_text = ''.join(f'{key}="{value}",' for key, value in labels)
+            cumulative = 0
+            for bound, bucket_count in zip(BUCKETS + ('+Inf',), counts):
+                cumulative += bucket_count
+                lines.append(f'{name}_bucket{{{label_text}le="{bound}"}} {cumulative}')
+            label_set = f"{{{label_text.rstrip(',')}}}" if labels else ''
+            lines.append(f"{name}_sum{label_set} {total:.6f}")
+            lines.append(f"{name}_count{label_set} {count}")
+        return '\n'.join(lines) + '\n'
+
+
+metrics = Metrics()
+
+
+def _add_stage(name, seconds):
+    stages = g.setdefault('timing_stages', {})
+    stages[name] = stages.get(name, 0.0) + seconds
+
+
+@contextmanager
+def _timed(stage):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        if has_request_context():
+            _add_stage(stage, seconds)
+        else:
+            # Di luar request: fase muat saat startup atau hot reload
+            metrics.observe('dashboard_load_duration_seconds', seconds, stage=stage)
+
+
+def timed(stage):
+    """Context manager untuk mencatat waktu satu tahap"""
+    return _timed(stage) if ENABLED else nullcontext()
+
+
+def set_labels(**labels):
+    """Label tambahan untuk callback yang sedang berjalan (misalnya tab)"""
+    if ENABLED and has_request_context():
+        g.setdefault('timing_labels', {}).update(labels)
+
+
+def instrument_callback(fn):
+    """Bungkus fungsi callback agar waktunya tercatat per nama callback"""
+    if not ENABLED:
+        return fn
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        g.timing_labels = {'callback': fn.__name__}
+        g.timing_start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            # Sisa waktu sampai after_request adalah serialisasi respons oleh Dash
+            g.timing_callback_end = time.perf_counter()
+
+    return wrapper
+
+
+def _record_request(response):
+    start = g.get('timing_start')
+    if start is None:
+        return response
+    now = time.perf_counter()
+    stages = g.get('timing_stages', {})
+    # Waktu setelah callback selesai, dikurangi kompresi yang dicatat terpisah
+    after_callback = now - g.get('timing_callback_end', now) - stages.get('compress', 0.0)
+    stages['serialize'] = stages.get('serialize', 0.0) + after_callback
+    labels = g.get('timing_labels', {})
+    labels.setdefault('tab', '')
+
+    metrics.observe('dashboard_callback_duration_seconds', now - start, **labels)
+    for stage, seconds in stages.items():
+        metrics.observe('dashboard_callback_stage_duration_seconds', seconds, stage=stage, **labels)
+
+    entries = [f"{stage};dur={seconds * 1000:.3f}" for stage, seconds in stages.items()]
+    entries.append(f'total;dur={(now - start) * 1000:.3f};desc="{labels["callback"]}"')
+    response.headers['Server-Timing'] = ', '.join(entries)
+    return response
+
+
+def install(server):
+    """Pasang header Server-Timing dan endpoint /metrics pada server Flask"""
+    if not ENABLED:
+        return
+    server.after_request(_record_request)
+
+    @server.route('/metrics')
+    def prometheus_metrics():
+        return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
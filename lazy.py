@@ -0,0 +1,29 @@
+# lazy.py
+import importlib
+
+
+class LazyModule:
+    """Modul yang baru diimpor saat atributnya pertama kali dipakai.
+
+    Dipakai untuk pustaka berat (pandas, plotly.express, joblib/scikit-learn)
+    agar import app.py tidak menunggu pustaka yang belum dibutuhkan, misalnya
+    saat konten tab dilayani dari bundle startup.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        return getattr(import_now(self), attr)
+
+    def __repr__(self):
+        state = 'dimuat' if self._module is not None else 'belum dimuat'
+        return f"<LazyModule {self._name} ({state})>"
+
+
+def import_now(lazy):
+    """Impor modul sekarang juga (tanpa menunggu atribut pertama) dan kembalikan modulnya"""
+    if lazy._module is None:
+        lazy._module = importlib.import_module(lazy._name)
+    return lazy._module
@@ -0,0 +1,319 @@
+# model_store.py
+import glob
+import hashlib
+import os
+import shutil
+from functools import lru_cache
+
+import numpy as np
+
+from lazy import LazyModule
+
+joblib = LazyModule('joblib')
+pd = LazyModule('pandas')
+
+# Model Random Forest yang dilatih di notebook, per variabel target
+MODEL_FILES = {
+    'renewables_share_elec': 'model_renewables_share_elec_rf.pkl',
+    'renewables_yoy_growth': 'model_renewables_yoy_rf.pkl',
+    'fossil_yoy_growth': 'model_fossil_yoy_rf.pkl',
+}
+
+# Kolom mentah dari dataset yang dibutuhkan model YoY
+RAW_FEATURES = [
+    'electricity_generation', 'fossil_electricity', 'renewables_electricity',
+    'solar_electricity', 'wind_electricity', 'hydro_electricity',
+    'biofuel_electricity', 'renewables_share_elec', 'renewables_share_energy',
+    'fossil_share_elec', 'carbon_intensity_elec', 'per_capita_electricity',
+]
+# Fitur turunan dari add_engineered_features, dalam urutan kolom model YoY
+ENGINEERED_FEATURES = [
+    'renewables_ratio_gen', 'fossil_ratio_gen', 'log_per_capita_elec',
+    'carbon_x_fossil', 'solar_plus_wind', 'renewable_share_ratio',
+]
+YOY_FEATURES = RAW_FEATURES + ENGINEERED_FEATURES
+# Model YoY memprediksi pertumbuhan tahun berikutnya dari fitur tahun ini
+YOY_HORIZON = 1
+
+# Artefak train.py di folder models/
+MANIFEST_FILE = 'manifest.json'
+PREDICTIONS_FILE = 'predictions.json'
+
+
+def find_models_dir():
+    for path in ('models', '../models'):
+        if os.path.isdir(path):
+            return path
+    return None
+
+
+def model_path(target, models_dir=None):
+    models_dir = models_dir or find_models_dir()
+    if models_dir is None:
+        return None
+    path = os.path.join(models_dir, MODEL_FILES[target])
+    return path if os.path.exists(path) else None
+
+
+def predictions_path(models_dir=None):
+    """Lokasi predictions.json hasil train.py (file belum tentu ada)"""
+    return os.path.join(models_dir or find_models_dir() or 'models', PREDICTIONS_FILE)
+
+
+def artifact_cache_dir():
+    """Folder untuk hasil komputasi yang disimpan di disk (dibuat bila belum ada)"""
+    path = os.environ.get('ARTIFACT_CACHE_DIR', '.cache')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def prune_artifacts(pattern, keep):
+    """Hapus artefak cache yang cocok dengan `pattern` (glob di ARTIFACT_CACHE_DIR)
+    kecuali yang namanya lolos `keep(nama)`.
+
+    File/folder sementara (.tmp) milik proses yang sedang menulis dilewati.
+    Array yang sudah di-memory-map proses lain tetap valid setelah dihapus.
+    """
+    for path in glob.glob(os.path.join(artifact_cache_dir(), pattern)):
+        name = os.path.basename(path)
+        if '.tmp' in name or keep(name):
+            continue
+        if os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+@lru_cache(maxsize=64)
+def _file_hash(path, mtime_ns, size):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def file_hash(path):
+    """SHA-256 isi file; hasilnya di-memo selama mtime dan ukuran file tidak berubah"""
+    st = os.stat(path)
+    return _file_hash(path, st.st_mtime_ns, st.st_size)
+
+
+@lru_cache(maxsize=None)
+def load_models(models_dir=None):
+    """Memuat model sekali per proses; model yang filenya tidak ada dilewati"""
+    models_dir = models_dir or find_models_dir()
+    models = {}
+    if models_dir is None:
+        print("Models directory not found, using fallback simulation")
+        return models
+    for target, filename in MODEL_FILES.items():
+        path = os.path.join(models_dir, filename)
+        if os.path.exists(path):
+            # Pickle biasa: array pohon disalin ke memori proses. Berbagi memori
+            # hanya lewat preload (copy-on-write) dan ForestArrays yang di-memory-map
+            models[target] = joblib.load(path)
+    return models
+
+
+def add_engineered_features(frame):
+    """Menambahkan fitur turunan yang dipakai saat training model YoY"""
+    frame = frame.copy()
+    frame['renewables_ratio_gen'] = frame['renewables_electricity'] / frame['electricity_generation']
+    frame['fossil_ratio_gen'] = frame['fossil_electricity'] / frame['electricity_generation']
+    frame['log_per_capita_elec'] = np.log1p(frame['per_capita_electricity'])
+    frame['carbon_x_fossil'] = frame['carbon_intensity_elec'] * frame['fossil_share_elec']
+    frame['solar_plus_wind'] = frame['solar_electricity'] + frame['wind_electricity']
+    frame['renewable_share_ratio'] = frame['renewables_share_elec'] / frame['renewables_share_energy']
+    return frame
+
+
+def training_rows(frame, features, target, horizon=0):
+    """Baris training satu model (train.py): nilai lengkap dan terhingga, urut tahun.
+
+    Dengan `horizon` > 0 fitur tahun t dipasangkan dengan target tahun
+    t + horizon. Urutan baris menentukan sampel bootstrap setiap pohon, jadi
+    residual OOB hanya benar bila baris disusun dengan cara yang sama seperti
+    saat training.
+    """
+    rows = frame[['year'] + [f for f in features if f != 'year']].copy()
+    if horizon:
+        rows[target] = (frame['year'] + horizon).map(frame.set_index('year')[target])
+    else:
+        rows[target] = frame[target]
+    rows = rows.replace([np.inf, -np.inf], np.nan).dropna().sort_values('year', kind='stable')
+    return rows[features], rows[target]
+
+
+def has_raw_features(df):
+    return set(RAW_FEATURES).issubset(df.columns)
+
+
+def scenario_features(base_row, overrides):
+    """Mengulang satu baris dasar untuk setiap skenario lalu menimpa fitur tertentu.
+
+    `overrides` berisi nama fitur -> array nilai (panjang sama untuk semua fitur).
+    Fitur turunan dihitung ulang setelah nilai mentah ditimpa.
+    """
+    n = len(next(iter(overrides.values()))) if overrides else 1
+    frame = pd.DataFrame({col: np.repeat(float(base_row[col]), n) for col in RAW_FEATURES})
+    for col, values in overrides.items():
+        frame[col] = np.asarray(values, dtype=float)
+    return add_engineered_features(frame)
+
+
+class ResponseSurface:
+    """Prediksi model untuk seluruh rentang slider, dihitung sekali di awal.
+
+    Grid diprediksi dalam satu panggilan `predict` sehingga pergeseran slider
+    hanya berupa lookup indeks. Nilai di luar grid dihitung satu per satu dan
+    disimpan di memo LRU dengan kunci nilai slider yang sudah dikuantisasi.
+    """
+
+    def __init__(self, model, base_row, feature, start, stop, step=0.1, memo_size=1024):
+        self.model = model
+        self.base_row = base_row
+        self.feature = feature
+        self.start = float(start)
+        self.step = float(step)
+        n = int(np.floor((float(stop) - self.start) / self.step + 1e-9)) + 1
+        self.grid = self.start + self.step * np.arange(n)
+        self.values = self._predict(self.grid)
+        self._memo = lru_cache(maxsize=memo_size)(self._predict_index)
+        self.reference = self.lookup(base_row[feature])
+
+    def _predict(self, values):
+        frame = scenario_features(self.base_row, {self.feature: values})
+        return self.model.predict(frame[self.model.feature_names_in_])
+
+    def _predict_index(self, index):
+        return float(self._predict([self.start + index * self.step])[0])
+
+    def lookup(self, value):
+        index = int(round((float(value) - self.start) / self.step))
+        if 0 <= index < len(self.values):
+            return float(self.values[index])
+        return self._memo(index)
+
+    def delta(self, value):
+        """Selisih prediksi terhadap nilai fitur saat ini"""
+        return self.lookup(value) - self.reference
+
+    def memo_info(self):
+        return self._memo.cache_info()
+
+
+class ForestArrays:
+    """Semua pohon dalam satu forest dikemas menjadi array 2D (pohon x node).
+
+    Dengan bentuk ini prediksi setiap pohon untuk setiap baris bisa dihitung
+    sekaligus dengan operasi numpy, tanpa loop Python per pohon.
+    """
+
+    FIELDS = ('feature', 'threshold', 'left', 'right', 'value', 'cover')
+
+    def __init__(self, feature, threshold, left, right, value, cover, max_depth):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.cover = cover
+        self.max_depth = int(max_depth)
+
+    @classmethod
+    def from_model(cls, model):
+        trees = [est.tree_ for est in model.estimators_]
+        n_trees = len(trees)
+        n_nodes = max(tree.node_count for tree in trees)
+        feature = np.zeros((n_trees, n_nodes), dtype=np.int32)
+        threshold = np.full((n_trees, n_nodes), np.inf)
+        # Node kosong dan daun menunjuk ke dirinya sendiri sehingga traversal
+        # yang sudah sampai di daun tetap diam di sana
+        own = np.broadcast_to(np.arange(n_nodes, dtype=np.int32), (n_trees, n_nodes))
+        left = own.copy()
+        right = own.copy()
+        value = np.zeros((n_trees, n_nodes))
+        cover = np.zeros((n_trees, n_nodes))
+        for i, tree in enumerate(trees):
+            n = tree.node_count
+            internal = tree.children_left[:n] >= 0
+            feature[i, :n] = np.where(internal, tree.feature[:n], 0)
+            threshold[i, :n] = np.where(internal, tree.threshold[:n], np.inf)
+            left[i, :n] = np.where(internal, tree.children_left[:n], np.arange(n))
+            right[i, :n] = np.where(internal, tree.children_right[:n], np.arange(n))
+            value[i, :n] = tree.value[:n, 0, 0]
+            cover[i, :n] = tree.weighted_n_node_samples[:n]
+        max_depth = max(tree.max_depth for tree in trees)
+        return cls(feature, threshold, left, right, value, cover, max_depth)
+
+    def save(self, path):
+        """Simpan setiap array sebagai .npy agar bisa di-memory-map proses lain"""
+        tmp_path = f"{path}.tmp-{os.getpid()}"
+        os.makedirs(tmp_path, exist_ok=True)
+        for name in self.FIELDS:
+            np.save(os.path.join(tmp_path, f"{name}.npy"), getattr(self, name))
+        np.save(os.path.join(tmp_path, 'max_depth.npy'), np.array(self.max_depth))
+        try:
+            os.replace(tmp_path, path)
+        except OSError:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+
+    @classmethod
+    def load(cls, path, mmap_mode='r'):
+        arrays = [np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap_mode) for name in cls.FIELDS]
+        max_depth = np.load(os.path.join(path, 'max_depth.npy'))
+        return cls(*arrays, max_depth)
+
+    @property
+    def n_trees(self):
+        return self.feature.shape[0]
+
+    def subset(self, start, stop):
+        return ForestArrays(*(getattr(self, name)[start:stop] for name in self.FIELDS), self.max_depth)
+
+    def predict_matrix(self, X):
+        """Prediksi setiap pohon untuk setiap baris: array (n_pohon, n_baris)"""
+        # sklearn membandingkan fitur dalam float32
+        X = np.asarray(X, dtype=np.float32).astype(np.float64)
+        n_rows = X.shape[0]
+        trees = np.arange(self.n_trees)[:, None]
+        rows = np.arange(n_rows)[None, :]
+        node = np.zeros((self.n_trees, n_rows), dtype=np.int64)
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[trees, node]] <= self.threshold[trees, node]
+            node = np.where(go_left, self.left[trees, node], self.right[trees, node])
+        return self.value[trees, node]
+
+
+# Artefak yang di-cache per hash file model: forests/<hash>, <jenis>-<hash>-<input>.npz
+MODEL_ARTIFACTS = ('uncertainty', 'attribution')
+
+
+@lru_cache(maxsize=None)
+def _load_forest_arrays(path, digest):
+    cache_path = os.path.join(artifact_cache_dir(), 'forests', digest[:16])
+    if not os.path.exists(os.path.join(cache_path, 'max_depth.npy')):
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        ForestArrays.from_model(joblib.load(path)).save(cache_path)
+    return ForestArrays.load(cache_path, mmap_mode='r')
+
+
+def forest_arrays(path):
+    """ForestArrays untuk file model, di-cache di disk dan dibaca via memory-map.
+
+    Halaman memory-map dibagi lewat page cache OS, sehingga semua worker
+    gunicorn memakai satu salinan array pohon.
+    """
+    return _load_forest_arrays(path, file_hash(path))
+
+
+def prune_model_artifacts(models_dir=None):
+    """Hapus artefak cache milik file model yang sudah tidak terpasang"""
+    current = {file_hash(path)[:16] for path in (model_path(t, models_dir) for t in MODEL_FILES) if path}
+    prune_artifacts(os.path.join('forests', '*'), lambda name: name in current)
+    for kind in MODEL_ARTIFACTS:
+        prune_artifacts(f"{kind}-*.npz", lambda name: name.split('-')[1] in current)
@@ -0,0 +1,186 @@
+# payload.py
+"""Memperkecil payload figure dan mengompresi respons.
+
+Data numerik setiap trace dikirim sebagai typed array Plotly (base64 biner):
+bilangan bulat memakai tipe integer terkecil yang cukup, float bisa diturunkan
+ke float32 (FIGURE_FLOAT32) dan dibulatkan (FIGURE_PRECISION digit desimal).
+Respons JSON dikompresi gzip/brotli sesuai Accept-Encoding; hasil kompresi
+disimpan per isi respons sehingga body yang sama tidak dikompresi ulang.
+"""
+import base64
+import gzip
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from flask import request
+
+from instrumentation import timed
+
+try:
+    import brotli
+except ImportError:  # brotli opsional; tanpa paket ini hanya gzip yang dipakai
+    brotli = None
+
+FIGURE_FLOAT32 = os.environ.get('FIGURE_FLOAT32', '1') == '1'
+FIGURE_PRECISION = int(os.environ['FIGURE_PRECISION']) if os.environ.get('FIGURE_PRECISION') else None
+RESPONSE_COMPRESSION = os.environ.get('RESPONSE_COMPRESSION', '1') == '1'
+
+# Array pendek lebih kecil sebagai list JSON biasa
+MIN_TYPED_ARRAY_LENGTH = 8
+# Atribut trace yang berisi data numerik per titik
+ARRAY_KEYS = ('x', 'y', 'z', 'values', 'r', 'theta', 'lat', 'lon', 'customdata', 'base', 'width')
+INT_DTYPES = (np.int8, np.uint8, np.int16, np.uint16, np.int32, np.uint32)
+
+COMPRESSIBLE_MIMETYPES = ('application/json', 'text/html', 'text/plain', 'text/csv')
+COMPRESSION_MIN_BYTES = 512
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def _decode(value):
+    """Nilai atribut trace -> array numpy, atau None bila bukan data numerik"""
+    if isinstance(value, dict) and 'bdata' in value and 'dtype' in value:
+        array = np.frombuffer(base64.b64decode(value['bdata']), dtype=value['dtype'])
+        if 'shape' in value:
+            array = array.reshape([int(n) for n in str(value['shape']).split(',')])
+        return array
+    if (isinstance(value, list) and len(value) >= MIN_TYPED_ARRAY_LENGTH
+            and all(type(v) in (int, float) for v in value)):
+        return np.array(value, dtype=float)
+    return None
+
+
+def compact_array(array, float32=FIGURE_FLOAT32, precision=FIGURE_PRECISION):
+    """Tipe data terkecil yang tetap mewakili nilai array"""
+    if array.dtype.kind == 'f' and array.size and np.isfinite(array).all() \
+            and (array == np.round(array)).all():
+        array = array.astype(np.int64)
+    if array.dtype.kind in 'iu':
+        for dtype in INT_DTYPES:
+            info = np.iinfo(dtype)
+            if array.size == 0 or (array.min() >= info.min and array.max() <= info.max):
+                return array.astype(dtype)
+        return array.astype(np.float64)
+    if array.dtype.kind == 'f':
+        if precision is not None:
+            array = np.round(array, precision)
+        if float32:
+            array = array.astype(np.float32)
+    return array
+
+
+def _encode(array):
+    encoded = {'dtype': f"{array.dtype.kind}{array.dtype.itemsize}",
+               'bdata': base64.b64encode(np.ascontiguousarray(array).tobytes()).decode('ascii')}
+    if array.ndim > 1:
+        encoded['shape'] = ','.join(map(str, array.shape))
+    return encoded
+
+
+def encode_figure(figure, **options):
+    """Ubah data numerik setiap trace menjadi typed array yang dipadatkan (in-place)"""
+    for trace in figure.get('data', []):
+        for key in ARRAY_KEYS:
+            array = _decode(trace.get(key))
+            if array is not None and array.dtype.kind in 'iuf':
+                trace[key] = _encode(compact_array(array, **options))
+    return figure
+
+
+def encode_payload(node, **options):
+    """Telusuri komponen Dash (hasil JSON) dan padatkan setiap figure di dalamnya"""
+    if isinstance(node, dict):
+        if isinstance(node.get('data'), list) and 'layout' in node:
+            return encode_figure(node, **options)
+        for value in node.values():
+            encode_payload(value, **options)
+    elif isinstance(node, list):
+        for value in node:
+            encode_payload(value, **options)
+    return node
+
+
+def compress(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def compressed_sizes(body):
+    """Ukuran body setelah setiap kompresi yang tersedia (untuk laporan per tab)"""
+    sizes = {'gzip': len(compress(body, 'gzip'))}
+    if brotli is not None:
+        sizes['br'] = len(compress(body, 'br'))
+    return sizes
+
+
+class ResponseCompressor:
+    """after_request Flask: kompresi respons dengan cache berdasarkan hash isi body.
+
+    Konten tab yang sama (dari FigureCache) menghasilkan body yang identik,
+    sehingga setelah request pertama hanya biaya hashing yang dibayar.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _choose_encoding(self):
+        accepted = request.accept_encodings
+        if brotli is not None and accepted['br']:
+            return 'br'
+        if accepted['gzip']:
+            return 'gzip'
+        return None
+
+    def compressed(self, body, encoding):
+        key = (encoding, hashlib.blake2b(body, digest_size=16).digest())
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached
+        data = compress(body, encoding)
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = data
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return data
+
+    def __call__(self, response):
+        if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+                or 'Content-Encoding' in response.headers
+                or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+            return response
+        encoding = self._choose_encoding()
+        if encoding is None:
+            return response
+        body = response.get_data()
+        if len(body) < COMPRESSION_MIN_BYTES:
+            return response
+        with timed('compress'):
+            response.set_data(self.compressed(body, encoding))
+        response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        return response
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries)}
+
+
+def install(server):
+    """Pasang kompresi respons pada server Flask (RESPONSE_COMPRESSION=0 untuk mematikan)"""
+    if not RESPONSE_COMPRESSION:
+        return None
+    compressor = ResponseCompressor()
+    server.after_request(compressor)
+    return compressor
@@ -0,0 +1,128 @@
+# preload.py
+"""Laporan memori worker untuk mode preload gunicorn.
+
+Jalankan `python preload.py --workers 3` untuk membandingkan RSS/PSS setiap
+worker tanpa preload (setiap worker memuat data dan model sendiri) dan dengan
+preload (dimuat sekali di master lalu dibagi copy-on-write setelah fork).
+"""
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+
+MEMORY_FIELDS = ('Rss', 'Pss', 'Shared_Clean', 'Shared_Dirty', 'Private_Clean', 'Private_Dirty')
+
+
+def memory_usage(pid='self'):
+    """Pemakaian memori proses dalam kB dari /proc (khusus Linux)"""
+    usage = {}
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as f:
+            for line in f:
+                key, _, rest = line.partition(':')
+                if key in MEMORY_FIELDS:
+                    usage[key] = int(rest.split()[0])
+    except OSError:
+        try:
+            with open(f'/proc/{pid}/status') as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        usage['Rss'] = int(line.split()[1])
+        except OSError:
+            pass
+    return usage
+
+
+def format_usage(usage):
+    return ', '.join(f"{key}={value / 1024:.1f}MB" for key, value in usage.items())
+
+
+def log_memory(label, logger=None):
+    message = f"[memori] {label}: {format_usage(memory_usage())}"
+    if logger is not None:
+        logger.info(message)
+    else:
+        print(message)
+
+
+def freeze_for_fork():
+    """Pindahkan semua objek ke generasi permanen GC sebelum fork.
+
+    Tanpa ini, GC di worker akan menulis header objek milik master dan
+    menyalin halaman memori yang seharusnya bisa dibagi.
+    """
+    gc.collect()
+    gc.freeze()
+
+
+def _exercise(app_module):
+    """Simulasikan beberapa request agar worker menyentuh data dan model"""
+    client = app_module.server.test_client()
+    for tab in app_module.TAB_BUILDERS:
+        client.post('/_dash-update-component', json={
+            'output': 'tab-content.children',
+            'outputs': {'id': 'tab-content', 'property': 'children'},
+            'inputs': [{'id': 'main-tabs', 'property': 'value', 'value': tab}],
+            'changedPropIds': ['main-tabs.value'],
+            'state': [],
+        })
+    client.post('/api/scenarios', json={'scenarios': [{'renewables_share_energy': 5.0 + i * 0.1} for i in range(200)]})
+
+
+def _measure(preload, workers):
+    if preload:
+        import app
+        freeze_for_fork()
+
+    children = []
+    for _ in range(workers):
+        ready_r, ready_w = os.pipe()
+        exit_r, exit_w = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            import app
+            _exercise(app)
+            os.write(ready_w, b'1')
+            os.read(exit_r, 1)
+            os._exit(0)
+        children.append((pid, ready_r, exit_w))
+
+    # Ukur setelah semua worker hidup bersamaan agar PSS mencerminkan halaman yang dibagi
+    for _, ready_r, _ in children:
+        os.read(ready_r, 1)
+    report = [{'pid': pid, **memory_usage(pid)} for pid, _, _ in children]
+    for pid, _, exit_w in children:
+        os.write(exit_w, b'1')
+        os.waitpid(pid, 0)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, default=3)
+    parser.add_argument('--mode', choices=['preload', 'no-preload'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(_measure(args.mode == 'preload', args.workers)))
+        return
+
+    # Setiap mode dijalankan di proses baru agar master tanpa preload benar-benar bersih
+    for mode in ('no-preload', 'preload'):
+        output = subprocess.run(
+            [sys.executable, __file__, '--mode', mode, '--workers', str(args.workers)],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        report = json.loads(output.strip().splitlines()[-1])
+        print(f"== {mode} ({args.workers} worker)")
+        for worker in report:
+            usage = {key: worker[key] for key in MEMORY_FIELDS if key in worker}
+            print(f"  worker {worker['pid']}: {format_usage(usage)}")
+        total_pss = sum(worker.get('Pss', worker.get('Rss', 0)) for worker in report)
+        print(f"  total PSS: {total_pss / 1024:.1f}MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,178 @@
+# scenario_api.py
+import csv
+import io
+import json
+import math
+import os
+from itertools import islice
+
+import numpy as np
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+
+from model_store import RAW_FEATURES, scenario_features
+
+# Jumlah skenario per panggilan predict; memori respons dibatasi per chunk
+CHUNK_SIZE = int(os.environ.get('SCENARIO_API_CHUNK', 2048))
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+# Model sklearn membandingkan fitur dalam float32
+FLOAT32_MAX = float(np.finfo(np.float32).max)
+
+
+class ScenarioEvaluator:
+    """Evaluasi banyak skenario sekaligus dengan model dan pipeline fitur dashboard.
+
+    Setiap skenario adalah dict nama fitur mentah -> nilai yang menimpa baris
+    dasar. Fitur turunan dihitung ulang, lalu setiap model dipanggil sekali
+    untuk seluruh chunk.
+    """
+
+    def __init__(self, models, base_row):
+        engineered = set(scenario_features(base_row, {}).columns)
+        self.models = {
+            target: model for target, model in models.items()
+            if set(model.feature_names_in_).issubset(engineered)
+        }
+        self.base_row = base_row
+
+    def evaluate(self, scenarios):
+        """Mengembalikan satu dict hasil per skenario, urutan sama dengan input"""
+        results = []
+        valid = []
+        for position, scenario in scenarios:
+            error = self._validate(scenario)
+            if error:
+                results.append({'id': position, 'error': error})
+            else:
+                results.append({'id': scenario.get('id', position)})
+                valid.append((len(results) - 1, scenario))
+
+        if valid:
+            used = sorted({key for _, scenario in valid for key in scenario if key != 'id'})
+            overrides = {
+                col: np.array([scenario.get(col, self.base_row[col]) for _, scenario in valid], dtype=float)
+                for col in used
+            }
+            if not overrides:
+                overrides = {RAW_FEATURES[0]: np.repeat(float(self.base_row[RAW_FEATURES[0]]), len(valid))}
+            frame = scenario_features(self.base_row, overrides)
+            # Fitur turunan bisa tak hingga (misalnya electricity_generation = 0)
+            # atau melewati batas float32; baris seperti itu dilaporkan per skenario
+            features = sorted({name for model in self.models.values() for name in model.feature_names_in_})
+            values = frame[features].to_numpy(dtype=float)
+            with np.errstate(invalid='ignore'):
+                bad = ~(np.isfinite(values) & (np.abs(values) <= FLOAT32_MAX))
+            for row in np.flatnonzero(bad.any(axis=1)):
+                columns = [name for name, flag in zip(features, bad[row]) if flag]
+                results[valid[row][0]]['error'] = f"non-finite or out-of-range features: {', '.join(columns)}"
+            ok = np.flatnonzero(~bad.any(axis=1))
+            if len(ok):
+                rows = frame.iloc[ok]
+                for target, model in self.models.items():
+                    predictions = model.predict(rows[model.feature_names_in_])
+                    for row, value in zip(ok, predictions):
+                        results[valid[row][0]][target] = float(value)
+        return results
+
+    @staticmethod
+    def _validate(scenario):
+        if not isinstance(scenario, dict):
+            return "scenario must be a JSON object"
+        unknown = set(scenario) - set(RAW_FEATURES) - {'id'}
+        if unknown:
+            return f"unknown features: {', '.join(sorted(unknown))}"
+        for key, value in scenario.items():
+            if key == 'id':
+                continue
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                return f"feature '{key}' must be numeric"
+            # Integer JSON bisa lebih besar dari batas float
+            try:
+                value = float(value)
+            except OverflowError:
+                return f"feature '{key}' is out of range"
+            if not math.isfinite(value):
+                return f"feature '{key}' must be finite"
+        return None
+
+
+def _iter_ndjson(stream):
+    for position, line in enumerate(stream):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield position, json.loads(line)
+        except ValueError:
+            yield position, None
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _encode_ndjson(rows, fields):
+    return ''.join(json.dumps(row) + '\n' for row in rows)
+
+
+def _encode_csv(rows, fields, header=False):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields, extrasaction='ignore')
+    if header:
+        writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+
+def create_scenario_blueprint(get_evaluator):
+    """Endpoint POST /api/scenarios.
+
+    Body berupa JSON {"scenarios": [...]} atau NDJSON (satu skenario per baris,
+    Content-Type application/x-ndjson). NDJSON dibaca bertahap sehingga ukuran
+    batch tidak dibatasi memori. Hasil dikirim bertahap sebagai NDJSON
+    (default) atau CSV (?format=csv).
+
+    `get_evaluator` dipanggil per request agar data/model yang dimuat ulang
+    langsung dipakai.
+    """
+    blueprint = Blueprint('scenario_api', __name__)
+
+    @blueprint.route('/api/scenarios', methods=['POST'])
+    def evaluate_scenarios():
+        evaluator = get_evaluator()
+        if evaluator is None or not evaluator.models:
+            return jsonify({'error': 'models are not available'}), 503
+
+        output_format = request.args.get('format', 'ndjson')
+        if output_format not in ('ndjson', 'csv'):
+            return jsonify({'error': "format must be 'ndjson' or 'csv'"}), 400
+
+        if request.mimetype == NDJSON_MIMETYPE:
+            scenarios = _iter_ndjson(request.stream)
+        else:
+            payload = request.get_json(silent=True)
+            if not isinstance(payload, dict) or not isinstance(payload.get('scenarios'), list):
+                return jsonify({'error': "body must be a JSON object with a 'scenarios' list"}), 400
+            scenarios = enumerate(payload['scenarios'])
+
+        fields = ['id', *evaluator.models, 'error']
+        if output_format == 'csv':
+            encode, mimetype = _encode_csv, 'text/csv'
+        else:
+            encode, mimetype = _encode_ndjson, NDJSON_MIMETYPE
+
+        def generate():
+            if output_format == 'csv':
+                yield _encode_csv([], fields, header=True)
+            for chunk in _chunks(scenarios, CHUNK_SIZE):
+                yield encode(evaluator.evaluate(chunk), fields)
+
+        return Response(stream_with_context(generate()), mimetype=mimetype)
+
+    return blueprint
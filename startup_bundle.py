@@ -0,0 +1,199 @@
+# startup_bundle.py
+"""Bundle startup: konten semua tab yang sudah diserialisasi dalam satu file.
+
+    python startup_bundle.py build      # bangun bundle (dijalankan saat build/deploy)
+    python startup_bundle.py profile    # rincian waktu import dan respons pertama
+
+Dengan FAST_START=1, app.py memuat bundle ini saat import sehingga layout dan
+konten tab langsung bisa dilayani; data dan model dimuat di latar belakang.
+Bundle hanya dipakai bila data, model, kode, pustaka, dan pengaturan yang
+memengaruhi payload sama dengan saat bundle dibuat.
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from importlib.metadata import version as package_version
+
+from dashboard_state import source_versions
+from model_store import artifact_cache_dir, file_hash
+
+FORMAT = 1
+BUNDLE_FILE = 'startup-bundle.json'
+
+# Pengaturan yang memengaruhi isi payload tab, beserta nilai default-nya
+SETTINGS = {
+    'CLIENTSIDE_SIMULATION': '1',
+    'FIGURE_FLOAT32': '1',
+    'FIGURE_PRECISION': '',
+    'DASHBOARD_COUNTRY': 'Indonesia',
+}
+LIBRARIES = ('dash', 'dash-bootstrap-components', 'plotly')
+
+
+def bundle_path():
+    return os.environ.get('STARTUP_BUNDLE') or os.path.join(artifact_cache_dir(), BUNDLE_FILE)
+
+
+def code_version():
+    """Hash kode aplikasi dan aset; bundle lama tidak dipakai setelah kode berubah"""
+    root = os.path.dirname(os.path.abspath(__file__))
+    h = hashlib.sha256()
+    for path in sorted(glob.glob(os.path.join(root, '*.py')) + glob.glob(os.path.join(root, 'assets', '*'))):
+        h.update(f"{os.path.relpath(path, root)}={file_hash(path)};".encode())
+    return h.hexdigest()
+
+
+def fingerprint(sources=None):
+    return {
+        'format': FORMAT,
+        'code': code_version(),
+        'libraries': {name: package_version(name) for name in LIBRARIES},
+        'settings': {key: os.environ.get(key, default) for key, default in SETTINGS.items()},
+        'sources': sources if sources is not None else source_versions(),
+    }
+
+
+def build_bundle(path=None):
+    """Bangun semua tab dari data dan model asli lalu simpan hasil serialisasinya"""
+    os.environ['FAST_START'] = '0'
+    import app
+
+    snap = app.state.ready()
+    app.warm_figure_cache(snap)
+    bundle = {
+        **fingerprint({name: snap.versions[name] for name in source_versions()}),
+        'versions': snap.versions,
+        'figures': app.figure_cache.export(),
+    }
+    path = path or bundle_path()
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with open(tmp_path, 'w') as f:
+        json.dump(bundle, f, separators=(',', ':'))
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_bundle(path=None):
+    """Bundle yang masih valid, atau None bila tidak ada atau sudah kedaluwarsa"""
+    path = path or bundle_path()
+    try:
+        with open(path) as f:
+            bundle = json.load(f)
+    except (OSError, ValueError):
+        return None
+    current = fingerprint()
+    stale = [key for key, value in current.items() if bundle.get(key) != value]
+    if stale:
+        print(f"Bundle startup {path} diabaikan (berubah: {', '.join(stale)})")
+        return None
+    return bundle
+
+
+# --- Profil waktu startup ---
+
+def _tab_request(tab):
+    return {
+        'output': 'tab-content.children',
+        'outputs': {'id': 'tab-content', 'property': 'children'},
+        'inputs': [{'id': 'main-tabs', 'property': 'value', 'value': tab}],
+        'changedPropIds': ['main-tabs.value'],
+        'state': [],
+    }
+
+
+# app diimpor paling awal agar breakdown -X importtime mencakup seluruh import-nya
+_CHILD = (
+    "import time; start = time.perf_counter(); import app; imported = time.perf_counter(); "
+    "import json, startup_bundle; print(json.dumps(startup_bundle._measure(start, imported)))"
+)
+
+
+def _measure(start, imported):
+    """Dijalankan di proses baru: waktu import app dan setiap request pertama"""
+    import app
+    marks = [('import app', imported - start)]
+
+    client = app.server.test_client()
+    requests = [
+        ('GET / (layout shell)', lambda: client.get('/')),
+        ('GET /_dash-layout', lambda: client.get('/_dash-layout')),
+        ('GET /_dash-dependencies', lambda: client.get('/_dash-dependencies')),
+        ('tab pertama (overview)', lambda: client.post('/_dash-update-component', json=_tab_request('tab-1-overview'))),
+    ]
+    for label, send in requests:
+        t = time.perf_counter()
+        response = send()
+        if response.status_code != 200:
+            raise RuntimeError(f"{label}: HTTP {response.status_code}")
+        marks.append((label, time.perf_counter() - t))
+    first_response = time.perf_counter() - start
+
+    app.state.ready()
+    ready = time.perf_counter() - start
+
+    from instrumentation import metrics
+    stages = sorted(
+        ((dict(labels)['stage'], histogram.sum) for (name, labels), histogram in metrics._histograms.items()
+         if name == 'dashboard_load_duration_seconds'),
+        key=lambda item: item[1], reverse=True,
+    )
+    return {'marks': marks, 'first_response': first_response, 'ready': ready, 'load_stages': stages}
+
+
+def _import_breakdown(importtime_log, top=8):
+    """Modul yang diimpor langsung oleh app.py, diurutkan dari waktu kumulatif terbesar"""
+    rows = []
+    for line in importtime_log.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        if depth == 0:
+            # Baris induk muncul setelah anak-anaknya
+            if name.strip() == 'app':
+                break
+            rows = []
+        elif depth == 1:
+            rows.append((name.strip(), int(cumulative) / 1e6))
+    return sorted(rows, key=lambda row: row[1], reverse=True)[:top]
+
+
+def profile():
+    for fast_start in ('0', '1'):
+        env = {**os.environ, 'FAST_START': fast_start}
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', _CHILD],
+            env=env, capture_output=True, text=True, check=True,
+        )
+        report = json.loads(result.stdout.strip().splitlines()[-1])
+        print(f"== FAST_START={fast_start}")
+        for label, seconds in report['marks']:
+            print(f"  {label:34s} {seconds * 1000:8.1f} ms")
+            if label == 'import app':
+                for module, module_seconds in _import_breakdown(result.stderr):
+                    print(f"    import {module:27s} {module_seconds * 1000:8.1f} ms")
+        print(f"  {'respons pertama (sejak mulai)':34s} {report['first_response'] * 1000:8.1f} ms")
+        print(f"  {'data dan model siap':34s} {report['ready'] * 1000:8.1f} ms")
+        for stage, seconds in report['load_stages'][:8]:
+            print(f"    muat {stage:29s} {seconds * 1000:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('command', choices=['build', 'profile'])
+    parser.add_argument('--output', help="lokasi bundle (default STARTUP_BUNDLE atau ARTIFACT_CACHE_DIR)")
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        print(f"Bundle startup ditulis ke {build_bundle(args.output)}")
+    else:
+        profile()
+
+
+if __name__ == '__main__':
+    main()
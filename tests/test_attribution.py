@@ -0,0 +1,35 @@
+# tests/test_attribution.py
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.inspection import partial_dependence as sklearn_partial_dependence
+
+from attribution import partial_dependence, tree_shap_values
+from model_store import ForestArrays
+
+
+@pytest.fixture(scope='module')
+def fitted():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(60, 4)), columns=['a', 'b', 'c', 'd'])
+    y = 2 * X['a'] - X['b'] * X['c'] + rng.normal(scale=0.1, size=60)
+    model = RandomForestRegressor(n_estimators=15, max_depth=4, random_state=0).fit(X, y)
+    return model, X
+
+
+def test_shap_values_are_additive(fitted):
+    model, X = fitted
+    shap_values, expected_value = tree_shap_values(ForestArrays.from_model(model), X.to_numpy())
+    assert shap_values.shape == X.shape
+    np.testing.assert_allclose(expected_value + shap_values.sum(axis=1), model.predict(X), atol=1e-10)
+
+
+def test_partial_dependence_matches_sklearn(fitted):
+    model, X = fitted
+    grid, values = partial_dependence(model, X, grid_points=7)
+    for j in range(X.shape[1]):
+        expected = sklearn_partial_dependence(
+            model, X, [j], custom_values={j: grid[j]}, kind='average', method='brute',
+        )
+        np.testing.assert_allclose(values[j], expected['average'][0], rtol=1e-10)
@@ -0,0 +1,56 @@
+# tests/test_background_jobs.py
+import importlib
+import os
+import time
+
+import pytest
+
+pytest.importorskip('diskcache')
+pytest.importorskip('multiprocess')
+
+SWEEP_REQUEST = {
+    'output': 'sweep-output.children',
+    'outputs': {'id': 'sweep-output', 'property': 'children'},
+    'inputs': [{'id': 'sweep-button', 'property': 'n_clicks', 'value': None}],
+    'changedPropIds': ['sweep-button.n_clicks'],
+    'state': [],
+}
+
+
+@pytest.fixture(scope='module')
+def dashboard(tmp_path_factory):
+    os.environ['ARTIFACT_CACHE_DIR'] = str(tmp_path_factory.mktemp('artifacts'))
+    os.environ['BACKGROUND_CALLBACKS'] = '1'
+    app = importlib.import_module('app')
+    if app.background_manager is None:
+        pytest.skip("background callback tidak aktif")
+    app.state.ready()
+    return app
+
+
+def post_sweep(client, n_clicks, **query):
+    body = dict(SWEEP_REQUEST, inputs=[dict(SWEEP_REQUEST['inputs'][0], value=n_clicks)])
+    response = client.post('/_dash-update-component', json=body, query_string=query)
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def test_sweep_result_is_reused_for_later_clicks(dashboard):
+    from background_jobs import CACHED_JOB
+
+    client = dashboard.server.test_client()
+    first = post_sweep(client, 1)
+    assert first['job'] != CACHED_JOB
+
+    # Polling seperti renderer Dash sampai hasil klik pertama tersedia
+    deadline = time.monotonic() + 120
+    while True:
+        poll = post_sweep(client, 1, cacheKey=first['cacheKey'], job=first['job'])
+        if 'response' in poll:
+            break
+        assert time.monotonic() < deadline, "sweep tidak selesai"
+        time.sleep(0.2)
+
+    second = post_sweep(client, 2)
+    assert second['job'] == CACHED_JOB
+    assert second['cacheKey'] == first['cacheKey']
@@ -0,0 +1,60 @@
+# tests/test_data_store.py
+import pytest
+
+import dashboard_state
+
+
+@pytest.fixture
+def owid_file(tmp_path, monkeypatch):
+    monkeypatch.setenv('ARTIFACT_CACHE_DIR', str(tmp_path / 'cache'))
+    path = tmp_path / 'owid.csv'
+    path.write_text("country,year,renewables_electricity\nIndonesia,2000,1.0\nVietnam,2000,2.0\n")
+    monkeypatch.setattr(dashboard_state, 'DATA_FILE', str(path))
+    return path
+
+
+def test_unknown_country_is_an_error_not_dummy_data(owid_file, monkeypatch):
+    monkeypatch.setattr(dashboard_state, 'DASHBOARD_COUNTRY', 'Indonesai')
+    with pytest.raises(ValueError, match="Indonesai"):
+        dashboard_state.load_data()
+
+
+def test_missing_file_falls_back_to_dummy_data(tmp_path, monkeypatch):
+    monkeypatch.setattr(dashboard_state, 'DATA_FILE', str(tmp_path / 'missing.csv'))
+    _, version = dashboard_state.load_data()
+    assert version == 'dummy'
+
+
+def test_conversion_removes_previous_csv_versions(owid_file, tmp_path):
+    from data_store import ColumnarStore
+
+    ColumnarStore.from_csv(str(owid_file))
+    with open(owid_file, 'a') as f:
+        f.write("Indonesia,2001,3.0\n")
+    store = ColumnarStore.from_csv(str(owid_file))
+    versions = list((tmp_path / 'cache' / 'columnar').iterdir())
+    assert [str(path) for path in versions] == [store.root]
+
+
+def test_artifacts_of_replaced_models_are_removed(tmp_path, monkeypatch):
+    from model_store import MODEL_FILES, file_hash, prune_model_artifacts
+
+    cache = tmp_path / 'cache'
+    monkeypatch.setenv('ARTIFACT_CACHE_DIR', str(cache))
+    models_dir = tmp_path / 'models'
+    models_dir.mkdir()
+    model_file = models_dir / MODEL_FILES['renewables_yoy_growth']
+    model_file.write_bytes(b'model')
+    current = file_hash(str(model_file))[:16]
+    old = '0' * 16
+
+    for name in (current, old):
+        (cache / 'forests' / name).mkdir(parents=True)
+        for kind in ('uncertainty', 'attribution'):
+            (cache / f"{kind}-{name}-abc.npz").write_bytes(b'')
+    prune_model_artifacts(str(models_dir))
+
+    assert [path.name for path in (cache / 'forests').iterdir()] == [current]
+    assert sorted(path.name for path in cache.glob('*.npz')) == [
+        f"attribution-{current}-abc.npz", f"uncertainty-{current}-abc.npz",
+    ]
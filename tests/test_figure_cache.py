@@ -0,0 +1,51 @@
+# tests/test_figure_cache.py
+import json
+
+import dash
+from dash import Input, Output, dcc, html
+
+from figure_cache import FigureCache, install
+
+
+def make_app(cache, builds):
+    app = dash.Dash(__name__)
+    app.layout = html.Div([dcc.Input(id='version', value='v1'), html.Div(id='content')])
+    install(app.server)
+
+    def build(version):
+        builds.append(version)
+        return html.Div([html.H4(f"Versi {version}"), dcc.Graph(figure={'data': [{'y': [1.5, 2.5]}]})])
+
+    @app.callback(Output('content', 'children'), Input('version', 'value'))
+    def render(version):
+        return cache.respond('tab', version, lambda: build(version))
+
+    return app
+
+
+def post(client, version):
+    body = {
+        'output': 'content.children',
+        'outputs': {'id': 'content', 'property': 'children'},
+        'inputs': [{'id': 'version', 'property': 'value', 'value': version}],
+        'changedPropIds': ['version.value'],
+        'state': [],
+    }
+    response = client.post('/_dash-update-component', json=body)
+    assert response.status_code == 200
+    return response.get_json()['response']['content']['children']
+
+
+def test_cached_json_is_spliced_into_the_response():
+    cache, builds = FigureCache(), []
+    client = make_app(cache, builds).server.test_client()
+
+    first = post(client, 'v1')
+    second = post(client, 'v1')
+    assert first == second == json.loads(cache.export()['tab']['json'])
+    assert first['props']['children'][0]['props']['children'] == "Versi v1"
+    assert builds == ['v1']
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    assert post(client, 'v2')['props']['children'][0]['props']['children'] == "Versi v2"
+    assert builds == ['v1', 'v2']
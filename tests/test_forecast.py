@@ -0,0 +1,87 @@
+# tests/test_forecast.py
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+
+from forecast import ForecastEngine, policy_path
+from model_store import RAW_FEATURES, YOY_FEATURES, add_engineered_features
+
+
+class CountingModel:
+    """Membungkus model dan mencatat jumlah baris setiap panggilan predict"""
+
+    def __init__(self, model):
+        self.model = model
+        self.feature_names_in_ = model.feature_names_in_
+        self.calls = []
+
+    def predict(self, X):
+        self.calls.append(len(X))
+        return self.model.predict(X)
+
+
+@pytest.fixture(scope='module')
+def history():
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame({name: rng.uniform(10, 100, 30) for name in RAW_FEATURES})
+    frame['year'] = np.arange(1994, 2024)
+    frame['electricity_generation'] = frame['renewables_electricity'] + frame['fossil_electricity']
+    frame = add_engineered_features(frame)
+    models = {}
+    for i, target in enumerate(['renewables_yoy_growth', 'fossil_yoy_growth']):
+        y = rng.normal(5 + i, 3, len(frame))
+        models[target] = RandomForestRegressor(n_estimators=10, max_depth=3, random_state=i).fit(frame[YOY_FEATURES], y)
+    return models, frame.iloc[-1]
+
+
+def counting(models):
+    return {target: CountingModel(model) for target, model in models.items()}
+
+
+def test_shared_prefix_is_not_predicted_again(history):
+    models, base_row = history
+    years = list(range(2024, 2030))
+    path_a = policy_path(years)
+    path_b = policy_path(years, renewables_pp=5.0, start_year=2027)  # sama dengan A sampai 2026
+
+    engine = ForecastEngine(counting(models), base_row)
+    engine.run([path_a])
+    calls_before = len(engine.renewables_model.calls)
+    result_b = engine.run([path_b])
+
+    # A memprediksi pertumbuhan untuk awalan sampai 2029; B hanya menambah cabang
+    # setelah aksi pertamanya (2027), sehingga awalan bersama tidak diprediksi ulang
+    new_rows = engine.renewables_model.calls[calls_before:]
+    assert sum(new_rows) == len(years) - years.index(2027) - 1
+    assert all(rows == 1 for rows in new_rows)
+    assert engine.fossil_model.calls[calls_before:] == new_rows
+
+    fresh = ForecastEngine(models, base_row).run([path_b])
+    for name in ('renewables_share_elec', 'renewables_yoy_growth', 'fossil_yoy_growth'):
+        np.testing.assert_allclose(result_b[name], fresh[name])
+
+
+def test_one_predict_per_model_per_step_for_all_paths(history):
+    models, base_row = history
+    years = list(range(2024, 2028))
+    paths = [policy_path(years, pp, 2025) for pp in (0.0, 2.0, 4.0, 6.0)]
+    engine = ForecastEngine(counting(models), base_row)
+    result = engine.run(paths)
+    assert len(engine.renewables_model.calls) == len(years)
+    assert result['renewables_share_elec'].shape == (len(paths), len(years))
+    # Semua jalur identik pada 2024
+    assert np.ptp(result['renewables_share_elec'][:, 0]) == 0
+
+
+def test_inputs_reproduce_the_path_growth(history):
+    # Tab keandalan memprediksi ulang dari input ini; hasilnya harus sama dengan proyeksi
+    models, base_row = history
+    path = policy_path(list(range(2024, 2028)), renewables_pp=3.0, start_year=2026)
+    engine = ForecastEngine(models, base_row)
+    result = engine.run([path])
+    inputs = engine.inputs(path)
+    assert len(inputs) == len(path)
+    predicted = models['renewables_yoy_growth'].predict(inputs[YOY_FEATURES])
+    actions = np.array([action[0] for action in path])
+    np.testing.assert_allclose(predicted + actions, result['renewables_yoy_growth'][0])
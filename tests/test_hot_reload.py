@@ -0,0 +1,80 @@
+# tests/test_hot_reload.py
+import os
+
+from hot_reload import DerivedGraph, FileWatcher, ReloadableState
+
+
+def make_state(versions):
+    """Graf kecil: x <- a, w <- a, y <- b, z <- (x, y); versi sumber dari dict `versions`"""
+    graph = DerivedGraph()
+    calls = []
+
+    @graph.node('a')
+    def x(a):
+        calls.append('x')
+        return a + 1
+
+    @graph.node('a')
+    def w(a):
+        calls.append('w')
+        return a * 2
+
+    @graph.node('b')
+    def y(b):
+        calls.append('y')
+        return [b]
+
+    @graph.node('x', 'y')
+    def z(x, y):
+        calls.append('z')
+        return x + len(y)
+
+    loaders = {name: (lambda name=name: (versions[name], f"v{versions[name]}")) for name in ('a', 'b')}
+    return ReloadableState(graph, loaders), calls
+
+
+def test_changing_one_source_recomputes_only_its_dependents():
+    versions = {'a': 1, 'b': 10}
+    state, calls = make_state(versions)
+    before = state.current
+    calls.clear()
+
+    versions['b'] = 11
+    after = state.reload(['b'])
+
+    assert sorted(after.recomputed) == ['y', 'z']
+    assert sorted(calls) == ['y', 'z']
+    assert after.x is before.x and after.w is before.w
+    assert after.y == [11]
+    assert after.version_of('x', 'w') == before.version_of('x', 'w')
+    assert after.version_of('z') != before.version_of('z')
+
+
+def test_reload_with_unchanged_content_recomputes_nothing():
+    versions = {'a': 1, 'b': 10}
+    state, calls = make_state(versions)
+    calls.clear()
+    assert state.reload(['a', 'b']).recomputed == ()
+    assert calls == []
+
+
+def test_file_watcher_reports_only_content_changes(tmp_path):
+    path = tmp_path / 'data.csv'
+    path.write_text('year\n2023\n')
+    changes = []
+    watcher = FileWatcher(lambda: [str(path)], changes.append)
+
+    # mtime berubah, isi sama: tidak dianggap perubahan
+    os.utime(path, ns=(1, 1))
+    assert watcher.poll() == []
+
+    path.write_text('year\n2023\n2024\n')
+    assert watcher.poll() == [str(path)]
+    assert changes == [[str(path)]]
+
+
+def test_dashboard_graph_is_complete_without_app():
+    # train.py dan test memakai create_state() tanpa mengimpor app.py
+    from dashboard_state import graph
+
+    assert {'simulation_surface', 'simulation_baseline', 'simulation_table'} <= set(graph.nodes)
@@ -0,0 +1,69 @@
+# tests/test_scenario_api.py
+import json
+
+import pytest
+from flask import Flask
+
+from dashboard_state import load_data
+from model_store import load_models
+from scenario_api import NDJSON_MIMETYPE, ScenarioEvaluator, create_scenario_blueprint
+
+HUGE_INT = 10 ** 400
+
+
+@pytest.fixture(scope='module')
+def client():
+    models = load_models()
+    if not models:
+        pytest.skip("model tidak tersedia")
+    df, _ = load_data()
+    evaluator = ScenarioEvaluator(models, base_row=df.iloc[-1])
+    server = Flask(__name__)
+    server.register_blueprint(create_scenario_blueprint(lambda: evaluator))
+    return server.test_client()
+
+
+def read_ndjson(response):
+    assert response.status_code == 200
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+BAD_SCENARIOS = [
+    ({'unknown_feature': 1.0}, 'unknown features: unknown_feature'),
+    ({'renewables_share_energy': True}, "feature 'renewables_share_energy' must be numeric"),
+    ({'renewables_share_energy': float('nan')}, "feature 'renewables_share_energy' must be finite"),
+    ({'renewables_share_energy': float('inf')}, "feature 'renewables_share_energy' must be finite"),
+    ({'renewables_share_energy': HUGE_INT}, "feature 'renewables_share_energy' is out of range"),
+    ({'electricity_generation': 0}, 'non-finite or out-of-range features'),
+]
+
+
+def assert_batch(results):
+    """Setiap skenario buruk mendapat error sendiri, skenario valid di akhir tetap diprediksi"""
+    assert len(results) == len(BAD_SCENARIOS) + 1
+    for result, (_, message) in zip(results, BAD_SCENARIOS):
+        assert message in result['error']
+    assert 'error' not in results[-1]
+    assert isinstance(results[-1]['renewables_yoy_growth'], float)
+
+
+def test_invalid_scenarios_are_reported_inline_json(client):
+    scenarios = [scenario for scenario, _ in BAD_SCENARIOS] + [{'renewables_share_energy': 20.0}]
+    # json.dumps menulis NaN/Infinity, yang juga diterima parser JSON Flask
+    body = json.dumps({'scenarios': scenarios})
+    response = client.post('/api/scenarios', data=body, content_type='application/json')
+    assert_batch(read_ndjson(response))
+
+
+def test_invalid_scenarios_are_reported_inline_ndjson(client):
+    lines = [json.dumps(scenario) for scenario, _ in BAD_SCENARIOS] + [json.dumps({'renewables_share_energy': 20.0})]
+    response = client.post('/api/scenarios', data='\n'.join(lines) + '\n', content_type=NDJSON_MIMETYPE)
+    assert_batch(read_ndjson(response))
+
+
+def test_malformed_ndjson_line_does_not_break_the_stream(client):
+    body = '{"renewables_share_energy": 20\nnot json\n{"renewables_share_energy": 25}\n'
+    results = read_ndjson(client.post('/api/scenarios', data=body, content_type=NDJSON_MIMETYPE))
+    assert [result.get('error') for result in results] == [
+        'scenario must be a JSON object', 'scenario must be a JSON object', None,
+    ]
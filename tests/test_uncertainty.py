@@ -0,0 +1,62 @@
+# tests/test_uncertainty.py
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+
+from model_store import ForestArrays, training_rows
+from uncertainty import oob_predictions, per_tree_predictions
+
+
+@pytest.mark.parametrize('max_samples', [None, 0.7])
+def test_oob_predictions_match_sklearn(max_samples):
+    # Mengunci rekonstruksi sampel bootstrap (helper privat sklearn) ke versi yang terpasang
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(50, 3))
+    y = X[:, 0] - 0.5 * X[:, 1] + rng.normal(scale=0.1, size=50)
+    model = RandomForestRegressor(
+        n_estimators=60, max_depth=3, max_samples=max_samples, oob_score=True, random_state=0,
+    ).fit(X, y)
+
+    train_preds = per_tree_predictions(ForestArrays.from_model(model), X, processes=1)
+    np.testing.assert_allclose(oob_predictions(model, train_preds), model.oob_prediction_.ravel(), rtol=1e-10)
+
+
+def test_training_rows_follow_train_py_order():
+    frame = pd.DataFrame({
+        'year': [2002, 2000, 2001, 2003],
+        'x': [2.0, 0.0, np.inf, 3.0],
+        'target': [20.0, 0.0, 10.0, np.nan],
+    })
+    X, y = training_rows(frame, ['x'], 'target')
+    assert list(X['x']) == [0.0, 2.0]
+    assert list(y) == [0.0, 20.0]
+
+
+def test_training_rows_pair_features_with_next_year_target():
+    frame = pd.DataFrame({
+        'year': [2001, 2000, 2002, 2004],
+        'x': [1.0, 0.0, 2.0, 4.0],
+        'target': [10.0, 0.0, 20.0, 40.0],
+    })
+    # 2002 dan 2004 tidak punya target tahun berikutnya (2003 tidak ada di data)
+    X, y = training_rows(frame, ['x'], 'target', horizon=1)
+    assert list(X['x']) == [0.0, 1.0]
+    assert list(y) == [10.0, 20.0]
+
+
+def test_results_for_previous_data_are_removed(tmp_path, monkeypatch):
+    import joblib
+
+    from uncertainty import compute_uncertainty
+
+    monkeypatch.setenv('ARTIFACT_CACHE_DIR', str(tmp_path / 'cache'))
+    rng = np.random.default_rng(2)
+    X = rng.normal(size=(20, 2))
+    model = RandomForestRegressor(n_estimators=5, random_state=0).fit(X, X[:, 0])
+    path = str(tmp_path / 'model.pkl')
+    joblib.dump(model, path)
+
+    compute_uncertainty(model, path, X[:2], X, X[:, 0])
+    compute_uncertainty(model, path, X[2:4], X, X[:, 0])
+    assert len(list((tmp_path / 'cache').glob('uncertainty-*.npz'))) == 1
@@ -0,0 +1,254 @@
+# train.py
+"""Pipeline training offline: melatih ulang model RF dan menulis artefak prediksi.
+
+    python train.py                # latih ulang target yang datanya berubah saja
+    python train.py --force        # latih ulang semua target
+    python train.py --check        # tampilkan target yang perlu dilatih, tanpa melatih
+    python train.py --jobs 4       # jumlah proses untuk CV dan pencarian hyperparameter
+
+Setiap target dilatih dengan GridSearchCV di atas TimeSeriesSplit (urutan tahun
+dipertahankan); semua kombinasi parameter x fold dijalankan paralel lewat joblib.
+Model terbaik disimpan berversi di models/versions/ lalu dipasang di file yang
+dibaca app (MODEL_FILES). models/manifest.json mencatat versi, parameter, metrik
+CV, dan sidik jari data setiap target; target yang sidik jarinya tidak berubah
+dilewati. models/predictions.json berisi nilai prediksi, metrik, dan koefisien
+Lasso/Ridge yang dibaca dashboard saat startup.
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+
+import numpy as np
+
+from dashboard_state import FORECAST_YEARS, forecast, load_data
+from model_store import (
+    MANIFEST_FILE, MODEL_FILES, YOY_FEATURES, YOY_HORIZON, add_engineered_features,
+    file_hash, find_models_dir, predictions_path, training_rows,
+)
+
+FORMAT = 1
+CV_SPLITS = 5
+
+# Ruang pencarian per target; parameter tetap mengikuti model dari notebook.
+# `horizon`: target tahun ke berapa setelah fitur (model YoY memprediksi tahun berikutnya)
+SEARCH_SPACES = {
+    'renewables_share_elec': {
+        'features': ['year'],
+        'horizon': 0,
+        'params': {'n_estimators': 100, 'random_state': 42},
+        'grid': {'max_depth': [None, 3, 5], 'min_samples_leaf': [1, 2, 4]},
+    },
+    'renewables_yoy_growth': {
+        'features': YOY_FEATURES,
+        'horizon': YOY_HORIZON,
+        'params': {'n_estimators': 200, 'max_features': 'sqrt', 'random_state': 42},
+        'grid': {'max_depth': [2, 3, 5], 'min_samples_split': [2, 5, 10]},
+    },
+    'fossil_yoy_growth': {
+        'features': YOY_FEATURES,
+        'horizon': YOY_HORIZON,
+        'params': {'n_estimators': 200, 'max_features': 'sqrt', 'random_state': 42},
+        'grid': {'max_depth': [2, 3, 5], 'min_samples_split': [2, 5, 10]},
+    },
+}
+
+# Tabel koefisien Lasso/Ridge (fitur distandarkan) di tab metodologi
+LINEAR_TARGET = 'renewables_share_elec'
+LINEAR_FEATURES = ['share_hydro_in_renew', 'fossil_yoy_growth', 'carbon_intensity_elec']
+
+SCORING = {
+    'mae': 'neg_mean_absolute_error',
+    'rmse': 'neg_root_mean_squared_error',
+    'r2': 'r2',
+}
+
+
+def training_set(frame, target):
+    """Fitur dan target satu model: baris dengan nilai lengkap, urut tahun"""
+    space = SEARCH_SPACES[target]
+    return training_rows(frame, space['features'], target, space['horizon'])
+
+
+def fingerprint(target, X, y):
+    """Sidik jari data dan konfigurasi training; model hanya dilatih ulang bila berubah"""
+    h = hashlib.sha256()
+    h.update(json.dumps({'format': FORMAT, 'splits': CV_SPLITS, **SEARCH_SPACES[target]},
+                        sort_keys=True, default=str).encode())
+    h.update(np.ascontiguousarray(X.to_numpy(dtype=float)).tobytes())
+    h.update(np.ascontiguousarray(y.to_numpy(dtype=float)).tobytes())
+    return h.hexdigest()
+
+
+def _atomic_write_json(data, path):
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def load_manifest(models_dir):
+    try:
+        with open(os.path.join(models_dir, MANIFEST_FILE)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'format': FORMAT, 'targets': {}}
+
+
+def needs_training(manifest, models_dir, target, fp):
+    entry = manifest['targets'].get(target)
+    path = os.path.join(models_dir, MODEL_FILES[target])
+    if entry is None or entry['fingerprint'] != fp or not os.path.exists(path):
+        return True
+    # File model diganti di luar pipeline (misalnya dari notebook)
+    return file_hash(path) != entry['sha256']
+
+
+def train_target(target, X, y, jobs):
+    """GridSearchCV dengan TimeSeriesSplit; model terbaik dilatih ulang di semua baris"""
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.model_selection import GridSearchCV, TimeSeriesSplit
+
+    space = SEARCH_SPACES[target]
+    search = GridSearchCV(
+        RandomForestRegressor(**space['params']),
+        space['grid'],
+        cv=TimeSeriesSplit(n_splits=CV_SPLITS),
+        scoring=SCORING,
+        refit='mae',
+        n_jobs=jobs,
+    )
+    search.fit(X, y)
+    best = search.best_index_
+    cv = {
+        'mae': float(-search.cv_results_['mean_test_mae'][best]),
+        'rmse': float(-search.cv_results_['mean_test_rmse'][best]),
+        'r2': float(search.cv_results_['mean_test_r2'][best]),
+    }
+    return search.best_estimator_, search.best_params_, cv
+
+
+def install_model(model, models_dir, target, version):
+    """Simpan model berversi lalu pasang (atomik) di lokasi yang dibaca app"""
+    import joblib
+
+    stem, ext = os.path.splitext(MODEL_FILES[target])
+    versions_dir = os.path.join(models_dir, 'versions')
+    os.makedirs(versions_dir, exist_ok=True)
+    versioned = os.path.join(versions_dir, f"{stem}-{version}{ext}")
+    tmp_path = f"{versioned}.tmp-{os.getpid()}"
+    joblib.dump(model, tmp_path)
+    os.replace(tmp_path, versioned)
+
+    current = os.path.join(models_dir, MODEL_FILES[target])
+    tmp_path = f"{current}.tmp-{os.getpid()}"
+    shutil.copyfile(versioned, tmp_path)
+    os.replace(tmp_path, current)
+    return versioned, current
+
+
+def linear_coefficients(frame, jobs):
+    """Koefisien LassoCV dan RidgeCV atas fitur yang distandarkan"""
+    from sklearn.linear_model import LassoCV, RidgeCV
+    from sklearn.model_selection import TimeSeriesSplit
+    from sklearn.preprocessing import StandardScaler
+
+    rows = frame.sort_values('year')[LINEAR_FEATURES + [LINEAR_TARGET]].dropna()
+    X = StandardScaler().fit_transform(rows[LINEAR_FEATURES])
+    y = rows[LINEAR_TARGET]
+    cv = TimeSeriesSplit(n_splits=CV_SPLITS)
+    lasso = LassoCV(cv=cv, n_jobs=jobs, random_state=42).fit(X, y)
+    ridge = RidgeCV(alphas=np.logspace(-3, 3, 25), cv=cv).fit(X, y)
+    return [
+        {'Feature': name, 'Lasso Coef': round(float(a), 3), 'Ridge Coef': round(float(b), 3)}
+        for name, a, b in zip(LINEAR_FEATURES, lasso.coef_, ridge.coef_)
+    ]
+
+
+def compute_predictions(df, models):
+    """Nilai prediksi yang ditampilkan dashboard: jalur dasar proyeksi rekursif dari model terpasang"""
+    result = forecast(df, models)
+    values = {}
+    if result is None:
+        return values
+    for year in FORECAST_YEARS:
+        if year not in result['years']:
+            continue
+        i = result['years'].index(year)
+        values[f'prediksi_pangsa_ebt_{year}'] = round(float(result['share'][i]), 4)
+        values[f'pred_yoy_ebt_{year}'] = round(float(result['renewables_yoy_growth'][i]), 4)
+        values[f'pred_yoy_fosil_{year}'] = round(float(result['fossil_yoy_growth'][i]), 4)
+    return values
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--models-dir', default=find_models_dir() or 'models')
+    parser.add_argument('--jobs', type=int, default=-1, help="proses paralel untuk CV (-1 = semua core)")
+    parser.add_argument('--force', action='store_true', help="latih ulang semua target")
+    parser.add_argument('--check', action='store_true', help="hanya tampilkan target yang perlu dilatih")
+    args = parser.parse_args()
+
+    df, data_version = load_data()
+    if data_version == 'dummy':
+        sys.exit("File data tidak ditemukan; training dibatalkan")
+    frame = add_engineered_features(df)
+    os.makedirs(args.models_dir, exist_ok=True)
+    manifest = load_manifest(args.models_dir)
+
+    pending = {}
+    for target in SEARCH_SPACES:
+        X, y = training_set(frame, target)
+        fp = fingerprint(target, X, y)
+        if args.force or needs_training(manifest, args.models_dir, target, fp):
+            pending[target] = (X, y, fp)
+        print(f"{target:24s} {len(X)} baris  {'latih ulang' if target in pending else 'tidak berubah'}")
+    if args.check:
+        sys.exit(1 if pending else 0)
+
+    for target, (X, y, fp) in pending.items():
+        start = time.perf_counter()
+        model, params, cv = train_target(target, X, y, args.jobs)
+        version = fp[:12]
+        versioned, current = install_model(model, args.models_dir, target, version)
+        previous = manifest['targets'].get(target)
+        history = (previous or {}).get('history', [])
+        if previous is not None and previous['version'] != version:
+            history = [previous['version']] + history
+        manifest['targets'][target] = {
+            'version': version,
+            'file': os.path.relpath(versioned, args.models_dir),
+            'sha256': file_hash(current),
+            'fingerprint': fp,
+            'rows': len(X),
+            'years': [int(frame.loc[X.index, 'year'].min()), int(frame.loc[X.index, 'year'].max())],
+            'params': {**SEARCH_SPACES[target]['params'], **params},
+            'cv': cv,
+            'trained_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'history': history,
+        }
+        print(f"{target:24s} versi {version}  MAE CV {cv['mae']:.3f}  RMSE {cv['rmse']:.3f}  "
+              f"{params}  ({time.perf_counter() - start:.1f} s)")
+
+    _atomic_write_json(manifest, os.path.join(args.models_dir, MANIFEST_FILE))
+
+    import joblib
+
+    models = {target: joblib.load(os.path.join(args.models_dir, MODEL_FILES[target])) for target in SEARCH_SPACES}
+    artifact = {
+        'format': FORMAT,
+        'data': data_version,
+        'models': {target: entry['version'] for target, entry in manifest['targets'].items()},
+        'predictions': compute_predictions(df, models),
+        'metrics': {target: entry['cv'] for target, entry in manifest['targets'].items()},
+        'linear_coefficients': linear_coefficients(df, args.jobs),
+    }
+    _atomic_write_json(artifact, predictions_path(args.models_dir))
+    print(f"Prediksi ditulis ke {predictions_path(args.models_dir)}")
+
+
+if __name__ == '__main__':
+    main()
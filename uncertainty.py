@@ -0,0 +1,125 @@
+# uncertainty.py
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from model_store import artifact_cache_dir, file_hash, forest_arrays, prune_artifacts
+
+QUANTILES = (5, 25, 50, 75, 95)
+
+# Di atas jumlah sel (pohon x baris) ini, prediksi per pohon dibagi ke beberapa proses
+PARALLEL_MIN_CELLS = 2_000_000
+
+# Jumlah skenario per potongan pada sweep ketidakpastian
+SWEEP_CHUNK = 25
+
+
+def _predict_chunk(forest, X):
+    return forest.predict_matrix(X)
+
+
+def per_tree_predictions(forest, X, processes=None):
+    """Prediksi setiap pohon untuk setiap baris: array (n_pohon, n_baris).
+
+    Untuk ensemble besar atau banyak skenario, pohon dibagi rata ke beberapa
+    proses (UNCERTAINTY_PROCESSES, default jumlah CPU).
+    """
+    X = np.asarray(X, dtype=float)
+    if processes is None:
+        processes = int(os.environ.get('UNCERTAINTY_PROCESSES', 0)) or os.cpu_count() or 1
+    if processes <= 1 or forest.n_trees * len(X) < PARALLEL_MIN_CELLS:
+        return forest.predict_matrix(X)
+
+    bounds = np.linspace(0, forest.n_trees, min(processes, forest.n_trees) + 1).astype(int)
+    chunks = [forest.subset(start, stop) for start, stop in zip(bounds[:-1], bounds[1:])]
+    with ProcessPoolExecutor(max_workers=len(chunks)) as pool:
+        parts = list(pool.map(_predict_chunk, chunks, [X] * len(chunks)))
+    return np.vstack(parts)
+
+
+def in_bag_counts(model, n_samples):
+    """Berapa kali setiap baris training masuk sampel bootstrap setiap pohon"""
+    # scikit-learn baru diimpor di sini (import-nya berat dan jarang dibutuhkan)
+    from sklearn.ensemble._forest import _generate_sample_indices, _get_n_samples_bootstrap
+
+    n_bootstrap = _get_n_samples_bootstrap(n_samples, model.max_samples)
+    counts = np.zeros((len(model.estimators_), n_samples), dtype=np.int32)
+    for i, estimator in enumerate(model.estimators_):
+        indices = _generate_sample_indices(estimator.random_state, n_samples, n_bootstrap)
+        counts[i] = np.bincount(indices, minlength=n_samples)
+    return counts
+
+
+def oob_predictions(model, train_preds):
+    """Rata-rata prediksi hanya dari pohon yang tidak melihat baris tersebut saat training"""
+    oob = in_bag_counts(model, train_preds.shape[1]) == 0
+    n_oob = oob.sum(axis=0)
+    total = np.where(oob, train_preds, 0.0).sum(axis=0)
+    return np.where(n_oob > 0, total / np.maximum(n_oob, 1), np.nan)
+
+
+def compute_uncertainty(model, path, X_future, X_train, y_train, processes=None):
+    """Statistik ketidakpastian dari sebaran prediksi antar pohon.
+
+    Hasil (rata-rata, std, pita kuantil, residual OOB) disimpan di disk dengan
+    kunci hash file model, sehingga hanya dihitung sekali per versi model.
+    """
+    X_future = np.ascontiguousarray(X_future, dtype=float)
+    X_train = np.ascontiguousarray(X_train, dtype=float)
+    y_train = np.ascontiguousarray(y_train, dtype=float)
+
+    inputs = hashlib.sha256()
+    for array in (X_future, X_train, y_train):
+        inputs.update(array.tobytes())
+    model_key = file_hash(path)[:16]
+    cache_path = os.path.join(artifact_cache_dir(), f"uncertainty-{model_key}-{inputs.hexdigest()[:12]}.npz")
+    if os.path.exists(cache_path):
+        with np.load(cache_path) as data:
+            return {key: data[key] for key in data.files}
+
+    forest = forest_arrays(path)
+    future_preds = per_tree_predictions(forest, X_future, processes)
+    result = {
+        'mean': future_preds.mean(axis=0),
+        'std': future_preds.std(axis=0),
+        'quantile_levels': np.array(QUANTILES),
+        'quantiles': np.percentile(future_preds, QUANTILES, axis=0),
+        'oob_residuals': np.array([]),
+    }
+
+    # Residual OOB hanya valid bila model dilatih dengan bootstrap pada baris yang sama
+    if model.bootstrap and getattr(model, '_n_samples', len(X_train)) == len(X_train):
+        oob_pred = oob_predictions(model, per_tree_predictions(forest, X_train, processes))
+        residuals = y_train - oob_pred
+        result['oob_residuals'] = residuals[np.isfinite(residuals)]
+
+    tmp_path = cache_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, **result)
+    os.replace(tmp_path, cache_path)
+    # Hasil model yang sama untuk data lama tidak akan dipakai lagi
+    name = os.path.basename(cache_path)
+    prune_artifacts(f"uncertainty-{model_key}-*.npz", lambda other: other == name)
+    return result
+
+
+def uncertainty_sweep(forest, X, progress=None, chunk_size=SWEEP_CHUNK):
+    """Rata-rata dan pita kuantil antar pohon untuk banyak skenario sekaligus.
+
+    Dihitung per potongan baris agar memori tetap kecil; `progress(selesai, total)`
+    dipanggil setelah setiap potongan (dipakai untuk progress bar di UI).
+    """
+    X = np.asarray(X, dtype=float)
+    means, quantiles = [], []
+    for start in range(0, len(X), chunk_size):
+        preds = per_tree_predictions(forest, X[start:start + chunk_size])
+        means.append(preds.mean(axis=0))
+        quantiles.append(np.percentile(preds, QUANTILES, axis=0))
+        if progress is not None:
+            progress(min(start + chunk_size, len(X)), len(X))
+    return {
+        'mean': np.concatenate(means),
+        'quantile_levels': np.array(QUANTILES),
+        'quantiles': np.hstack(quantiles),
+    }